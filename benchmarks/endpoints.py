@@ -0,0 +1,292 @@
+"""
+Benchmark register, login, /pdf/profile and /pdf/save end to end.
+
+Both FastAPI apps run in this process with their lifespans (so the
+hashing, render and export pools are started as in production), against
+SQLite or a local Postgres and moto's in-memory SQS/S3. Requests go
+through the gateway, either in-process (`--transport asgi`) or over real
+sockets to two uvicorn servers (`--transport http`).
+
+Usage:
+    python -m benchmarks.endpoints --requests 500 --concurrency 20 --output after.json
+    python -m benchmarks.endpoints --transport http --compare before.json
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import platform
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import date
+
+# The service settings are read at import time; these are only defaults
+# for variables the benchmark doesn't actually use.
+for name, value in {
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "SQS_QUEUE_URL": "http://localhost:4566/000000000000/pdf-queue",
+    "S3_BUCKET_NAME": "pdf-bucket",
+    "AWS_ENDPOINT_URL": "",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from moto import mock_aws  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from benchmarks.load import (  # noqa: E402
+    compare,
+    free_port,
+    git_revision,
+    load,
+    print_results,
+    run_load,
+    save,
+)
+from pdf_service.src.aws import clients  # noqa: E402
+from pdf_service.src.core.config import settings as pdf_settings  # noqa: E402
+from pdf_service.src.main import app as pdf_app  # noqa: E402
+from pdf_service.src.pdf.router import save_dedup  # noqa: E402
+from user_service.src import main as gateway  # noqa: E402
+from user_service.src.core.database import (  # noqa: E402
+    Base,
+    get_async_session,
+    get_read_session,
+)
+from user_service.src.core.upstream import UpstreamClient  # noqa: E402
+from user_service.src.security.password import configure_rounds, current_rounds, hash_password  # noqa: E402
+from user_service.src.security.token_manager import create_access_token  # noqa: E402
+from user_service.src.user import routers as user_routers  # noqa: E402
+from user_service.src.user.models import UserModel  # noqa: E402
+
+SCENARIOS = ("register", "login", "pdf_profile", "pdf_save")
+PASSWORD = "Secure123!"
+
+
+@asynccontextmanager
+async def database(url: str):
+    """Point the gateway at a fresh schema in `url` for the duration of the run."""
+    connect_args = {"timeout": 30} if url.startswith("sqlite") else {}
+    engine = create_async_engine(url, connect_args=connect_args)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_session():
+        async with session_maker() as session:
+            yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    gateway.app.dependency_overrides[get_async_session] = get_session
+    gateway.app.dependency_overrides[get_read_session] = get_session
+    user_routers.async_session_maker = session_maker
+    # The lifespan would warm the configured database's pool, not this one
+    gateway.warm_up_pool = lambda: asyncio.sleep(0)
+    try:
+        yield session_maker
+    finally:
+        gateway.app.dependency_overrides.pop(get_async_session, None)
+        gateway.app.dependency_overrides.pop(get_read_session, None)
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def aws():
+    """moto's SQS and S3 behind pdf_service's shared clients."""
+    os.environ.pop("AWS_ENDPOINT_URL", None)
+    pdf_settings.AWS_ENDPOINT_URL = None
+    clients.close_clients()
+    with mock_aws():
+        pdf_settings.SQS_QUEUE_URL = clients.get_sqs_client().create_queue(
+            QueueName="pdf-queue"
+        )["QueueUrl"]
+        clients.get_s3_client().create_bucket(Bucket=pdf_settings.S3_BUCKET_NAME)
+        yield
+        clients.close_clients()
+
+
+async def seed_users(session_maker, run_id: str, count: int) -> list[dict]:
+    """Insert `count` users directly (one bcrypt hash for all) and return their tokens."""
+    hashed = hash_password(PASSWORD)
+    users = [
+        UserModel(
+            name="Bench",
+            surname=f"User{i}",
+            email=f"seed-{run_id}-{i}@example.com",
+            date_of_birthday=date(1990, 1, 15),
+            hashed_password=hashed,
+        )
+        for i in range(count)
+    ]
+    async with session_maker() as session:
+        session.add_all(users)
+        await session.commit()
+    return [
+        {
+            "email": user.email,
+            "token": create_access_token(
+                user_id=user.id,
+                email=user.email,
+                name=user.name,
+                surname=user.surname,
+                date_of_birthday=str(user.date_of_birthday),
+            ),
+        }
+        for user in users
+    ]
+
+
+def make_senders(client: httpx.AsyncClient, run_id: str, users: list[dict]) -> dict:
+    # Shared by warm-up and measured runs, so every registration uses a new email
+    registrations = itertools.count()
+
+    async def register(i: int) -> int:
+        response = await client.post("/api/v1/user/register/", json={
+            "name": "Bench",
+            "surname": "User",
+            "email": f"register-{run_id}-{next(registrations)}@example.com",
+            "date_of_birthday": "1990-01-15",
+            "password": PASSWORD,
+        })
+        return response.status_code
+
+    async def login(i: int) -> int:
+        user = users[i % len(users)]
+        response = await client.post(
+            "/api/v1/user/login/", json={"email": user["email"], "password": PASSWORD}
+        )
+        return response.status_code
+
+    async def pdf_profile(i: int) -> int:
+        headers = {"Authorization": f"Bearer {users[i % len(users)]['token']}"}
+        response = await client.get("/api/v1/pdf/profile", headers=headers)
+        return response.status_code
+
+    async def pdf_save(i: int) -> int:
+        headers = {"Authorization": f"Bearer {users[i % len(users)]['token']}"}
+        response = await client.post("/api/v1/pdf/save", headers=headers)
+        return response.status_code
+
+    return {"register": register, "login": login, "pdf_profile": pdf_profile, "pdf_save": pdf_save}
+
+
+@asynccontextmanager
+async def asgi_apps():
+    """Both apps in-process, with the gateway calling pdf_service through ASGITransport."""
+    gateway.pdf_service_client = UpstreamClient(
+        "http://pdf_service", transport=httpx.ASGITransport(app=pdf_app)
+    )
+    async with AsyncExitStack() as stack:
+        await stack.enter_async_context(pdf_app.router.lifespan_context(pdf_app))
+        await stack.enter_async_context(gateway.app.router.lifespan_context(gateway.app))
+        yield httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=gateway.app), base_url="http://gateway", timeout=60
+        )
+
+
+@asynccontextmanager
+async def http_apps():
+    """Both apps behind uvicorn on loopback ports, served from a separate thread and event loop."""
+    pdf_port, gateway_port = free_port(), free_port()
+    gateway.pdf_service_client = UpstreamClient(f"http://127.0.0.1:{pdf_port}")
+    servers = [
+        uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        for app, port in ((pdf_app, pdf_port), (gateway.app, gateway_port))
+    ]
+
+    async def serve():
+        await asyncio.gather(*(server.serve() for server in servers))
+
+    thread = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+    thread.start()
+    while not all(server.started for server in servers):
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        await asyncio.sleep(0.05)
+    try:
+        yield httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{gateway_port}",
+            timeout=60,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+    finally:
+        for server in servers:
+            server.should_exit = True
+        thread.join()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.bcrypt_rounds:
+        configure_rounds(args.bcrypt_rounds)
+    run_id = uuid.uuid4().hex[:8]
+    database_url = args.database_url or (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='bench-')}/users.db"
+    )
+    apps = asgi_apps if args.transport == "asgi" else http_apps
+    # Seeded users are reused across requests; without this most saves
+    # would be answered from the dedup window instead of queueing a message.
+    save_dedup.window_seconds = 0
+
+    results = {}
+    async with aws(), database(database_url) as session_maker:
+        users = await seed_users(session_maker, run_id, args.users)
+        async with apps() as client, client:
+            senders = make_senders(client, run_id, users)
+            for scenario in args.scenarios:
+                # A short warm-up so connection set-up and first renders aren't measured
+                await run_load(senders[scenario], min(args.concurrency, args.requests), args.concurrency)
+                results[scenario] = await run_load(
+                    senders[scenario], args.requests, args.concurrency
+                )
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "transport": args.transport,
+            "database": database_url.split(":", 1)[0],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "bcrypt_rounds": current_rounds(),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, default=100, help="seeded users for login/PDF calls")
+    parser.add_argument("--transport", choices=("asgi", "http"), default="asgi")
+    parser.add_argument(
+        "--database-url", help="defaults to a temporary SQLite file, e.g. postgresql+asyncpg://..."
+    )
+    parser.add_argument("--bcrypt-rounds", type=int, help="defaults to PASSWORD_HASH_ROUNDS")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=10, help="regression threshold for --compare, in %%"
+    )
+    args = parser.parse_args()
+
+    data = asyncio.run(run(args))
+    print_results(data["results"])
+    if args.output:
+        save(args.output, data)
+    if args.compare:
+        regressions = compare(load(args.compare), data, args.threshold)
+        if regressions:
+            raise SystemExit(f"Regressions: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Load generation and result handling shared by the benchmark scripts."""
+import asyncio
+import json
+import math
+import socket
+import subprocess
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], statuses: Counter, elapsed: float, concurrency: int) -> dict:
+    ordered = sorted(latencies)
+    requests = len(ordered)
+    errors = sum(count for status, count in statuses.items() if not 200 <= status < 400)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+        "req_per_sec": requests / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": sum(ordered) / requests * 1000 if requests else 0.0,
+            "p50": percentile(ordered, 50) * 1000,
+            "p95": percentile(ordered, 95) * 1000,
+            "p99": percentile(ordered, 99) * 1000,
+            "max": ordered[-1] * 1000 if ordered else 0.0,
+        },
+    }
+
+
+async def run_load(
+    send: Callable[[int], Awaitable[int]], requests: int, concurrency: int
+) -> dict:
+    """
+    Call `send(i)` for i in range(requests) from `concurrency` concurrent workers.
+
+    `send` returns the HTTP status code; exceptions count as status 0.
+    """
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                status = await send(i)
+            except Exception:
+                status = 0
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return summarize(latencies, statuses, time.perf_counter() - started, concurrency)
+
+
+def compare(baseline: dict, current: dict, threshold_pct: float) -> list[str]:
+    """
+    Print a comparison of two result files and return the regressions.
+
+    A scenario regresses when its req/s dropped, or its p95 latency grew,
+    by more than `threshold_pct` percent.
+    """
+    for key in ("transport", "database", "concurrency", "bcrypt_rounds"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(
+                f"note: {key} differs ({baseline['meta'].get(key)} -> {current['meta'].get(key)}), "
+                "numbers are not directly comparable"
+            )
+    regressions = []
+    for scenario, result in current["results"].items():
+        before = baseline["results"].get(scenario)
+        if before is None:
+            continue
+        rps = _change(before["req_per_sec"], result["req_per_sec"])
+        p95 = _change(before["latency_ms"]["p95"], result["latency_ms"]["p95"])
+        print(f"{scenario:>12}: req/s {rps:+7.1f}%  p95 {p95:+7.1f}%")
+        if rps < -threshold_pct or p95 > threshold_pct:
+            regressions.append(scenario)
+    return regressions
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def print_results(results: dict) -> None:
+    for scenario, result in results.items():
+        latency = result["latency_ms"]
+        print(
+            f"{scenario:>12}: {result['req_per_sec']:9.1f} req/s  "
+            f"p50 {latency['p50']:8.2f} ms  p95 {latency['p95']:8.2f} ms  "
+            f"p99 {latency['p99']:8.2f} ms  errors {result['errors']}"
+        )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path: str, data: dict) -> None:
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
@@ -0,0 +1,230 @@
+"""
+Measure cold-start cost of both services and enforce a startup budget.
+
+For each app this records:
+- the cumulative `python -X importtime` cost of importing its main module
+  (median of `--runs` fresh interpreters) and its heaviest direct imports;
+- time from spawning `python -m common.server <app> --workers 1` to the
+  first answer on `/health/live` (the process serves requests) and to 200
+  on `/health/ready` (the lifespan warm-up finished). uvicorn only
+  accepts connections once the lifespan has started up, so the two are
+  normally close; a gap means requests were served before warm-up ended.
+
+pdf_service is started first and user_service is pointed at it, as in
+docker-compose. Without a reachable Postgres the gateway's pool warm-up
+fails fast and is logged, so readiness times are still meaningful.
+
+Results are checked against the budget file (`startup_budget.json`,
+milliseconds per app and metric, sized for a single-CPU container); any
+median over budget makes the script exit non-zero.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --output startup.json
+    python -m benchmarks.startup --budget my_budget.json
+"""
+import argparse
+import os
+import platform
+import re
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.load import free_port, git_revision, load, save
+
+APPS = {
+    "pdf_service": "pdf_service.src.main",
+    "user_service": "user_service.src.main",
+}
+DEFAULT_BUDGET = os.path.join(os.path.dirname(__file__), "startup_budget.json")
+READY_TIMEOUT = 60
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def import_time(module: str) -> tuple[float, list[tuple[str, float]]]:
+    """Cumulative import time of `module` in ms and its direct imports, slowest first."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    ).stderr
+    total = 0.0
+    children: list[tuple[str, float]] = []
+    pending: list[tuple[str, float]] = []
+    # A module's line comes after those of the modules it imported
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if not indent:
+            if name == module:
+                total, children = int(cumulative) / 1000, pending
+            pending = []
+        elif len(indent) == 2:
+            pending.append((name, int(cumulative) / 1000))
+    return total, sorted(children, key=lambda child: -child[1])
+
+
+def measure_imports(module: str, runs: int, top: int) -> dict:
+    totals = []
+    heaviest: list[tuple[str, float]] = []
+    for _ in range(runs):
+        total, children = import_time(module)
+        totals.append(total)
+        heaviest = heaviest or children
+    return {
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "heaviest": {name: ms for name, ms in heaviest[:top]},
+    }
+
+
+def _status(url: str) -> int | None:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except OSError:
+        return None
+
+
+def start_server(app: str, port: int, env: dict) -> tuple[subprocess.Popen, dict]:
+    """Spawn one server worker and time it until it answers live and ready."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "common.server", f"{app}:app",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", "1", "--drain-delay", "0",
+            # stderr is only read on failure; polling would fill the pipe with access logs
+            "--no-access-log",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    base = f"http://127.0.0.1:{port}"
+    timings = {}
+    while "ready_ms" not in timings:
+        if process.poll() is not None:
+            raise RuntimeError(f"{app} exited during start-up:\n{process.stderr.read().decode()}")
+        if time.perf_counter() - started > READY_TIMEOUT:
+            process.kill()
+            raise RuntimeError(f"{app} not ready after {READY_TIMEOUT}s")
+        if "first_response_ms" not in timings:
+            if _status(f"{base}/health/live") == 200:
+                timings["first_response_ms"] = (time.perf_counter() - started) * 1000
+        elif _status(f"{base}/health/ready") == 200:
+            timings["ready_ms"] = (time.perf_counter() - started) * 1000
+        time.sleep(0.01)
+    return process, timings
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def measure_startup(runs: int) -> dict[str, dict]:
+    samples: dict[str, dict[str, list[float]]] = {name: {} for name in APPS}
+    for _ in range(runs):
+        pdf_port, user_port = free_port(), free_port()
+        env = {**os.environ, "PDF_SERVICE_URL": f"http://127.0.0.1:{pdf_port}"}
+        processes = []
+        try:
+            for name, port in (("pdf_service", pdf_port), ("user_service", user_port)):
+                process, timings = start_server(APPS[name], port, env)
+                processes.append(process)
+                for key, value in timings.items():
+                    samples[name].setdefault(key, []).append(value)
+        finally:
+            for process in reversed(processes):
+                stop_server(process)
+    return {
+        name: {key: statistics.median(values) for key, values in timings.items()}
+        for name, timings in samples.items()
+    }
+
+
+def check_budget(results: dict, budget: dict) -> list[str]:
+    """Every `<app>.<metric>` whose median is over its budgeted milliseconds."""
+    violations = []
+    for name, limits in budget.items():
+        for metric, limit_ms in limits.items():
+            value = results.get(name, {}).get(metric)
+            if value is not None and value > limit_ms:
+                violations.append(f"{name}.{metric} {value:.0f} ms > {limit_ms} ms")
+    return violations
+
+
+def print_results(results: dict, budget: dict) -> None:
+    for name, result in results.items():
+        limits = budget.get(name, {})
+        print(f"{name}:")
+        for metric in ("import_ms", "first_response_ms", "ready_ms"):
+            if metric in result:
+                limit = f"  (budget {limits[metric]} ms)" if metric in limits else ""
+                print(f"  {metric:>17}: {result[metric]:8.1f} ms{limit}")
+        for module, ms in result.get("heaviest_imports", {}).items():
+            print(f"  {'':>17}  {ms:8.1f} ms  {module}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="repetitions, medians are reported")
+    parser.add_argument("--top", type=int, default=5, help="heaviest direct imports to list")
+    parser.add_argument("--skip-servers", action="store_true", help="only measure import times")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="budget JSON, ms per app and metric")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    # Throwaway defaults: settings are read at import time
+    for key, value in {
+        "POSTGRES_USER": "bench",
+        "POSTGRES_PASSWORD": "bench",
+        "POSTGRES_DB": "bench",
+        "SQS_QUEUE_URL": "http://localhost:4566/000000000000/pdf-queue",
+        "S3_BUCKET_NAME": "pdf-bucket",
+        # Clients are only created at start-up, nothing is sent to LocalStack
+        "AWS_ENDPOINT_URL": "http://localhost:4566",
+        "AWS_DEFAULT_REGION": "us-east-1",
+    }.items():
+        os.environ.setdefault(key, value)
+
+    results = {}
+    for name, module in APPS.items():
+        imports = measure_imports(module, args.runs, args.top)
+        results[name] = {"import_ms": imports["median_ms"], "heaviest_imports": imports["heaviest"]}
+    if not args.skip_servers:
+        for name, timings in measure_startup(args.runs).items():
+            results[name].update(timings)
+
+    budget = load(args.budget)
+    print_results(results, budget)
+    if args.output:
+        save(args.output, {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "runs": args.runs,
+            },
+            "results": results,
+        })
+    violations = check_budget(results, budget)
+    if violations:
+        raise SystemExit("Over startup budget: " + "; ".join(violations))
+
+
+if __name__ == "__main__":
+    main()
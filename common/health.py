@@ -0,0 +1,83 @@
+"""
+Liveness and readiness of a service process.
+
+`/health/live` answers as long as the process serves requests at all.
+`/health/ready` only answers 200 between the end of the lifespan warm-up
+(`health.mark_ready()`) and the start of shutdown, so load balancers send
+traffic to warm workers only and stop before a worker goes away.
+"""
+import logging
+import os
+import signal
+import threading
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class Health:
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.draining = False
+
+    def start_draining(self) -> None:
+        self.draining = True
+
+    @property
+    def status(self) -> str:
+        if self.draining:
+            return "draining"
+        return "ready" if self.ready else "starting"
+
+
+health = Health()
+
+router = APIRouter(prefix="/health", include_in_schema=False)
+
+
+@router.get("/live")
+async def liveness():
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    status = health.status
+    return JSONResponse({"status": status}, status_code=200 if status == "ready" else 503)
+
+
+def install_drain_handler(delay: float | None = None) -> None:
+    """
+    Fail readiness on SIGTERM and pass the signal on to the server `delay` seconds later.
+
+    The delay (`SERVER_DRAIN_DELAY`, set by `common.server`) gives load
+    balancers time to notice the failing readiness check before the server
+    stops accepting connections; in-flight requests are then drained by
+    uvicorn's graceful shutdown. Must be called from the lifespan, after
+    uvicorn installed its own handler; does nothing outside the main thread.
+    """
+    if delay is None:
+        delay = float(os.getenv("SERVER_DRAIN_DELAY", "0"))
+    if delay <= 0 or threading.current_thread() is not threading.main_thread():
+        return
+    server_handler = signal.getsignal(signal.SIGTERM)
+    if not callable(server_handler):
+        return
+
+    def handle_term(signum, frame):
+        if health.draining:
+            server_handler(signum, frame)
+            return
+        logger.info("SIGTERM received, draining for %.1fs before shutting down", delay)
+        health.start_draining()
+        timer = threading.Timer(delay, server_handler, args=(signum, frame))
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, handle_term)
@@ -0,0 +1,89 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def jose_jwt():
+    """
+    The `jose.jwt` module, imported on first use.
+
+    python-jose pulls in its crypto backends and takes ~0.1s to import,
+    so the services import it from their lifespan warm-up instead of at
+    app import time.
+    """
+    from jose import jwt
+
+    return jwt
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of JWT payloads that already passed `jwt.decode`.
+
+    Clients send the same access token with every request, so verifying
+    the HMAC and parsing the claims again each time is wasted work. A hit
+    returns a copy of the payload verified earlier.
+
+    Entries are keyed by a SHA-256 digest of the token together with the
+    key and algorithms it was verified with, so rotating the secret never
+    serves a payload signed with the old one. An entry is dropped once
+    the token's `exp` has passed, using the same whole-second comparison
+    as python-jose, and the token then goes through `jwt.decode` again,
+    which raises the usual `ExpiredSignatureError`. Failed verifications
+    are not cached.
+
+    Shared by user_service and pdf_service; each service owns one instance.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[int | None, dict]] = OrderedDict()
+        # pdf_service resolves auth in sync dependencies, i.e. from the thread pool
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        """Drop-in for `jwt.decode(token, key, algorithms=algorithms)`."""
+        if self.max_entries <= 0:
+            return jose_jwt().decode(token, key, algorithms=algorithms)
+
+        digest = hashlib.sha256(
+            "\0".join([*algorithms, key, token]).encode()
+        ).digest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                exp, payload = entry
+                if exp is None or int(time.time()) <= exp:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return dict(payload)
+                del self._entries[digest]
+                self.expired += 1
+            self.misses += 1
+
+        payload = jose_jwt().decode(token, key, algorithms=algorithms)
+        # jwt.decode has already checked that `exp`, if present, is an integer
+        exp = int(payload["exp"]) if "exp" in payload else None
+        with self._lock:
+            self._entries[digest] = (exp, payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dict(payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+        }
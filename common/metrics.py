@@ -0,0 +1,297 @@
+"""
+Minimal Prometheus-style metrics: labelled histograms and gauges.
+
+Recording is a `perf_counter` call, a bisect over the bucket bounds and a
+few integer additions under an uncontended lock (about a microsecond), so
+the instrumentation stays on under full load. Each process has its own
+`REGISTRY`; processes that can't serve HTTP themselves (worker pools)
+ship `Registry.snapshot()` to a parent, which combines them with
+`merge` before `render`.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; from sub-millisecond cache hits to multi-second bcrypt/S3 calls
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_lock", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self._bounds = bounds
+        self._lock = threading.Lock()
+        # One count per bucket plus the +Inf bucket; not cumulative
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(self._bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram:
+    """A histogram family with one label, e.g. `stage_duration_seconds{stage="..."}`."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, description: str, label: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self._children: dict[str, _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, value: str) -> _HistogramChild:
+        child = self._children.get(value)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(value, _HistogramChild(self.buckets))
+        return child
+
+    def time(self, value: str):
+        """Context manager observing the duration of the block under label `value`."""
+        return self.labels(value).time()
+
+    def snapshot(self) -> dict:
+        return {
+            "kind": self.kind,
+            "description": self.description,
+            "label": self.label,
+            "buckets": list(self.buckets),
+            "series": {
+                value: {"counts": list(child.counts), "sum": child.sum}
+                for value, child in list(self._children.items())
+            },
+        }
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    @contextmanager
+    def track_inprogress(self):
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Gauge:
+    """A gauge family with one label, e.g. `http_requests_in_flight{app="..."}`."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, label: str):
+        self.name = name
+        self.description = description
+        self.label = label
+        self._children: dict[str, _GaugeChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, value: str) -> _GaugeChild:
+        child = self._children.get(value)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(value, _GaugeChild())
+        return child
+
+    def snapshot(self) -> dict:
+        return {
+            "kind": self.kind,
+            "description": self.description,
+            "label": self.label,
+            "series": {value: child.value for value, child in list(self._children.items())},
+        }
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Histogram | Gauge] = {}
+
+    def histogram(
+        self, name: str, description: str, label: str, buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(name, lambda: Histogram(name, description, label, buckets))
+
+    def gauge(self, name: str, description: str, label: str) -> Gauge:
+        return self._register(name, lambda: Gauge(name, description, label))
+
+    def _register(self, name, factory):
+        # Idempotent, so modules imported by both services can declare the same metric
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = factory()
+        return metric
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+def merge(snapshots: list[dict]) -> dict:
+    """Sum registry snapshots of several processes (histogram counts and gauge values)."""
+    merged: dict = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "series": {}})
+            for value, series in metric["series"].items():
+                if metric["kind"] == "gauge":
+                    target["series"][value] = target["series"].get(value, 0) + series
+                    continue
+                current = target["series"].setdefault(
+                    value, {"counts": [0] * len(series["counts"]), "sum": 0.0}
+                )
+                current["counts"] = [a + b for a, b in zip(current["counts"], series["counts"])]
+                current["sum"] += series["sum"]
+    return merged
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(snapshot: dict) -> str:
+    """Prometheus text exposition format (version 0.0.4) of a registry snapshot."""
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['description']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        label = metric["label"]
+        for value, series in sorted(metric["series"].items()):
+            if metric["kind"] == "gauge":
+                lines.append(f'{name}{{{label}="{value}"}} {_format_value(series)}')
+                continue
+            cumulative = 0
+            for bound, count in zip([*metric["buckets"], "+Inf"], series["counts"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}="{value}"}} {series["sum"]!r}')
+            lines.append(f'{name}_count{{{label}="{value}"}} {cumulative}')
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "stage_duration_seconds", "Time spent in each stage of request handling", "stage"
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", "route"
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", "app"
+)
+
+
+def metrics_text() -> str:
+    """This process's metrics in the text exposition format."""
+    return render(REGISTRY.snapshot())
+
+
+def start_http_server(port: int, collect=metrics_text) -> ThreadingHTTPServer:
+    """
+    Serve `collect()` on `GET /metrics` from a daemon thread.
+
+    For processes without a web app (the pdf_saver worker and supervisor).
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = collect().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: in-flight gauge and latency histogram per route template.
+
+    The route template (e.g. `/api/v1/pdf/profile`) is known only after
+    routing, so it is read from the scope once the app returns; unmatched
+    paths share one series to keep cardinality bounded. Streaming
+    responses are timed until their last chunk was sent.
+    """
+
+    def __init__(self, app, name: str):
+        self.app = app
+        self.in_flight = IN_FLIGHT.labels(name)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight.dec()
+            REQUEST_SECONDS.labels(route_template(scope)).observe(time.perf_counter() - started)
+
+
+def route_template(scope) -> str:
+    """The path template of the route that handled `scope`, e.g. `/api/v1/pdf/profile`."""
+    route = scope.get("route")
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return "unmatched"
+    path = scope["path"]
+    template = route.path_format
+    if regex.match(path):
+        return template
+    # Routes of an included router may only know their path relative to
+    # the router's prefix; the prefix is the part of the path before them.
+    for index in range(1, len(path)):
+        if path[index] == "/" and regex.match(path[index:]):
+            return path[:index] + template
+    return template
@@ -0,0 +1,208 @@
+"""
+Opt-in sampling profiler for single requests, written out as flame graphs.
+
+`ProfilingMiddleware` is only added to an app when `PROFILE_DIR` is set,
+so a disabled profiler costs nothing. When enabled, a request is profiled
+if it carries `X-Profile: <PROFILE_API_KEY>` or is picked at
+`PROFILE_SAMPLE_RATE`; a background thread then samples the stacks of the
+event-loop thread and of every busy worker thread every
+`PROFILE_INTERVAL_MS` until the response is sent.
+
+Output is either collapsed stacks (`flamegraph.pl`, speedscope, and most
+flame graph viewers read them) or a speedscope JSON file. Work done in
+other processes (process pools) is not visible to the sampler.
+"""
+import asyncio
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from common.metrics import route_template
+
+FORMATS = ("collapsed", "speedscope")
+
+# A worker thread whose innermost frame is in one of these is waiting for work
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}:{frame.f_lineno}"
+
+
+def _stack(frame) -> tuple[str, ...]:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of this process's threads from a daemon thread.
+
+    The thread that calls `start()` (the event loop) is always sampled,
+    idle or not, because time it spends waiting in the selector is time
+    the request spent waiting on I/O. Other threads are only sampled while
+    they run something, so an idle executor does not flood the profile.
+    Samples are keyed by thread name, then stack.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter[tuple[str, tuple[str, ...]]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target: int | None = None
+        self.started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self.samples
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident != self._target and frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                self.samples[(names.get(ident, str(ident)), _stack(frame))] += 1
+
+
+def collapsed(samples: Counter) -> str:
+    """Brendan Gregg's folded format: `thread;outer;...;inner count` per line."""
+    return "".join(
+        f"{';'.join((thread, *stack))} {count}\n"
+        for (thread, stack), count in sorted(samples.items())
+    )
+
+
+def speedscope(samples: Counter, interval: float, name: str) -> dict:
+    """A speedscope file with one sampled profile per thread."""
+    frames: dict[str, int] = {}
+    profiles: dict[str, dict] = {}
+    for (thread, stack), count in samples.items():
+        profile = profiles.setdefault(thread, {
+            "type": "sampled",
+            "name": f"{name} [{thread}]",
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": 0,
+            "samples": [],
+            "weights": [],
+        })
+        profile["samples"].append([frames.setdefault(frame, len(frames)) for frame in stack])
+        profile["weights"].append(count * interval)
+        profile["endValue"] += count * interval
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "shared": {"frames": [{"name": frame} for frame in frames]},
+        "profiles": list(profiles.values()),
+    }
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling selected requests with `StackSampler`.
+
+    One request is profiled at a time per process: the sampler sees every
+    thread, so concurrent profiles would attribute each other's work.
+    Requests arriving meanwhile run unprofiled. Profiles requested with the
+    header get an `X-Profile-File` response header naming the output file.
+    """
+
+    def __init__(
+        self,
+        app,
+        name: str,
+        directory: str,
+        api_key: str | None = None,
+        sample_rate: float = 0.0,
+        interval_ms: float = 5,
+        output_format: str = "collapsed",
+    ):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown profile format {output_format!r}, expected one of {FORMATS}")
+        self.app = app
+        self.name = name
+        self.directory = directory
+        self.api_key = api_key.encode() if api_key else None
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.output_format = output_format
+        self._busy = threading.Lock()
+        self._count = 0
+
+    def _requested(self, scope) -> bool:
+        if self.api_key is None:
+            return False
+        for key, value in scope["headers"]:
+            if key == b"x-profile":
+                return hmac.compare_digest(value, self.api_key)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = self._requested(scope)
+        selected = requested or random.random() < self.sample_rate
+        if not selected or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        self._count += 1
+        extension = "txt" if self.output_format == "collapsed" else "speedscope.json"
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_")[:60] or "root"
+        filename = (
+            f"{self.name}-{scope['method']}-{path}-{time.strftime('%Y%m%dT%H%M%S')}"
+            f"-{os.getpid()}-{self._count}.{extension}"
+        )
+
+        async def send_with_header(message):
+            if requested and message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []), (b"x-profile-file", filename.encode())
+                ]
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            samples = sampler.stop()
+            self._busy.release()
+            title = f"{scope['method']} {route_template(scope)} ({sampler.duration * 1000:.1f} ms)"
+            await asyncio.to_thread(self._write, filename, title, samples)
+
+    def _write(self, filename: str, title: str, samples: Counter) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, filename)
+        with open(path, "w") as file:
+            if self.output_format == "collapsed":
+                file.write(collapsed(samples))
+            else:
+                json.dump(speedscope(samples, self.interval, title), file)
@@ -0,0 +1,74 @@
+"""
+Production entrypoint for the FastAPI services.
+
+Binds the listening socket once and starts `--workers` uvicorn worker
+processes that accept on it, restarting any that die. Each worker runs
+the app's lifespan, which warms its pools before the worker reports
+ready on `/health/ready`. On SIGTERM a worker fails readiness, waits
+`--drain-delay` seconds, stops accepting connections and finishes
+in-flight requests for up to `--graceful-timeout` seconds.
+
+Usage:
+    python -m common.server user_service.src.main:app --port 8000
+    python -m common.server pdf_service.src.main:app --port 8001 --workers 4
+
+Every worker starts its own process pools (password hashing, PDF
+rendering), so size `*_WORKERS` settings per worker, not per container.
+"""
+import argparse
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("app", help="import string, e.g. user_service.src.main:app")
+    parser.add_argument("--host", default=os.getenv("SERVER_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SERVER_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))),
+        help="worker processes (WEB_CONCURRENCY, defaults to the number of CPUs)",
+    )
+    parser.add_argument(
+        "--drain-delay",
+        type=float,
+        default=float(os.getenv("SERVER_DRAIN_DELAY", "5")),
+        help="seconds between failing readiness and closing the listener on SIGTERM",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30")),
+        help="seconds in-flight requests get to finish on shutdown",
+    )
+    parser.add_argument(
+        "--keep-alive", type=int, default=int(os.getenv("SERVER_KEEP_ALIVE", "5"))
+    )
+    parser.add_argument(
+        "--access-log",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("SERVER_ACCESS_LOG", "true").lower() not in ("0", "false", "no", "off"),
+        help="log every request (SERVER_ACCESS_LOG, on by default)",
+    )
+    args = parser.parse_args()
+
+    # Read by `install_drain_handler` in each worker's lifespan
+    os.environ["SERVER_DRAIN_DELAY"] = str(args.drain_delay)
+    uvicorn.run(
+        args.app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",
+        timeout_graceful_shutdown=args.graceful_timeout,
+        timeout_keep_alive=args.keep_alive,
+        proxy_headers=True,
+        access_log=args.access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
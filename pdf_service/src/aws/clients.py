@@ -1,22 +1,109 @@
-import boto3
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from pdf_service.src.core.config import settings
 
+# boto3 sessions are not thread-safe; clients are, once created.
+_lock = threading.Lock()
+_clients: dict[str, object] = {}
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_client(service: str):
+    """
+    The process-wide boto3 client for `service`.
+
+    Creating a client loads the service model and endpoint data, which
+    takes tens of milliseconds, so each process builds one per service and
+    shares it between threads. The connection pool is sized to
+    `AWS_MAX_POOL_CONNECTIONS` so concurrent calls don't queue for sockets.
+    boto3 itself is imported on the first call (`warm_up` in the lifespan).
+    """
+    client = _clients.get(service)
+    if client is not None:
+        return client
+    with _lock:
+        if service in _clients:
+            return _clients[service]
+        import boto3
+        from botocore.config import Config
+
+        client = _clients[service] = boto3.session.Session().client(
+            service,
+            endpoint_url=settings.AWS_ENDPOINT_URL,
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+            config=Config(
+                max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+                connect_timeout=settings.AWS_CONNECT_TIMEOUT,
+                read_timeout=settings.AWS_READ_TIMEOUT,
+                retries={"mode": "standard"},
+                tcp_keepalive=True,
+            ),
+        )
+        return client
+
 
 def get_sqs_client():
-    return boto3.client(
-        "sqs",
-        endpoint_url=settings.AWS_ENDPOINT_URL,
-        region_name="us-east-1",
-        aws_access_key_id="test",
-        aws_secret_access_key="test",
-    )
+    return get_client("sqs")
 
 
 def get_s3_client():
-    return boto3.client(
-        "s3",
-        endpoint_url=settings.AWS_ENDPOINT_URL,
-        region_name="us-east-1",
-        aws_access_key_id="test",
-        aws_secret_access_key="test",
-    )
\ No newline at end of file
+    return get_client("s3")
+
+
+def warm_up() -> None:
+    get_sqs_client()
+    get_s3_client()
+
+
+def close_clients() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    for client in _clients.values():
+        client.close()
+    _clients.clear()
+
+
+def _reset_after_fork() -> None:
+    # A forked child must not share the parent's sockets or executor threads.
+    global _executor, _lock
+    _executor = None
+    _lock = threading.Lock()
+    _clients.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+async def _run(func, /, **kwargs):
+    # botocore is blocking; calls run on a dedicated pool as large as the
+    # connection pool, so they neither block the event loop nor compete with
+    # other users of the default executor.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.AWS_MAX_POOL_CONNECTIONS, thread_name_prefix="aws"
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, **kwargs))
+
+
+async def send_message(**kwargs) -> dict:
+    return await _run(get_sqs_client().send_message, **kwargs)
+
+
+async def put_object(**kwargs) -> dict:
+    return await _run(get_s3_client().put_object, **kwargs)
+
+
+async def generate_presigned_url(client_method: str, **kwargs) -> str:
+    return await _run(
+        get_s3_client().generate_presigned_url, ClientMethod=client_method, **kwargs
+    )
@@ -5,9 +5,38 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     SECRET_KEY_ACCESS: str = Field(default="super-secret-key", env="SECRET_KEY_ACCESS")
     JWT_SIGNING_ALGORITHM: str = "HS256"
+    # Verified-token cache size (0 disables it)
+    JWT_CACHE_MAX_ENTRIES: int = 10_000
     AWS_ENDPOINT_URL: str
     SQS_QUEUE_URL: str
     S3_BUCKET_NAME: str
+    # Per-process boto3 connection pool, shared by all threads of the process
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_CONNECT_TIMEOUT: float = 5
+    AWS_READ_TIMEOUT: float = 30
+
+    PDF_RENDER_WORKERS: int = 2
+
+    PDF_CACHE_MAX_ENTRIES: int = 1024
+    PDF_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PDF_CACHE_TTL_SECONDS: int = 3600
+    # Optional on-disk tier shared by all processes on the host
+    PDF_CACHE_DIR: str | None = None
+    # Size bound of the directory (defaults to PDF_CACHE_MAX_BYTES), enforced by a periodic sweep
+    PDF_CACHE_DIR_MAX_BYTES: int | None = None
+    PDF_CACHE_SWEEP_INTERVAL_SECONDS: float = 300
+    # Repeated /pdf/save calls for an unchanged profile within this window
+    # queue one message (0 only merges concurrent calls)
+    PDF_SAVE_DEDUP_WINDOW_SECONDS: float = 10
+
+    # Request profiling (common/profiling.py); disabled unless a directory is set
+    PROFILE_DIR: str | None = None
+    # Value of the X-Profile header that profiles a request on demand
+    PROFILE_API_KEY: str | None = None
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 5
+    # "collapsed" (folded stacks) or "speedscope"
+    PROFILE_FORMAT: str = "collapsed"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,12 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from common.health import health, install_drain_handler, router as health_router
+from common.jwt_cache import jose_jwt
+from common.metrics import CONTENT_TYPE, MetricsMiddleware, metrics_text
+from common.profiling import ProfilingMiddleware
+from pdf_service.src.aws.clients import close_clients, warm_up
+from pdf_service.src.core.config import settings
+from pdf_service.src.pdf.cache import profile_pdf_cache
+from pdf_service.src.pdf.render_pool import render_pool
 from pdf_service.src.pdf.router import router as pdf_router
+from pdf_service.src.pdf.service import get_profile_template
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(warm_up)
+    await asyncio.to_thread(jose_jwt)
+    # Imports ReportLab and compiles the template used by in-process renders
+    await asyncio.to_thread(get_profile_template)
+    await render_pool.start()
+    profile_pdf_cache.start()
+    install_drain_handler()
+    health.mark_ready()
+    yield
+    health.start_draining()
+    profile_pdf_cache.close()
+    render_pool.shutdown()
+    close_clients()
+
 
 app = FastAPI(
     title="PDF Service API",
+    lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware, name="pdf_service")
+if settings.PROFILE_DIR:
+    app.add_middleware(
+        ProfilingMiddleware,
+        name="pdf_service",
+        directory=settings.PROFILE_DIR,
+        api_key=settings.PROFILE_API_KEY,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        interval_ms=settings.PROFILE_INTERVAL_MS,
+        output_format=settings.PROFILE_FORMAT,
+    )
+app.include_router(health_router)
 app.include_router(pdf_router, prefix="/api/v1")
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(metrics_text(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 def read_root():
     return {"status": "PDF Service is running"}
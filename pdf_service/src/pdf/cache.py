@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from pdf_service.src.core.config import settings
+from pdf_service.src.pdf.service import TEMPLATE_VERSION
+
+logger = logging.getLogger(__name__)
+
+# A temp file older than this is left over from a failed write, not in progress
+STALE_TMP_SECONDS = 60
+
+
+def render_key(name: str, surname: str, email: str, date_of_birthday) -> str:
+    """
+    Content address of a profile PDF: a hash of everything the output depends on.
+
+    Rendering is deterministic (see `generate_user_pdf`), so equal keys mean
+    byte-identical PDFs and the key doubles as a strong ETag.
+    """
+    material = json.dumps(
+        [TEMPLATE_VERSION, name, surname, email, str(date_of_birthday)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class RenderCache:
+    """
+    In-process LRU of rendered PDFs with size/TTL eviction and an optional disk tier.
+
+    The memory tier is bounded by both entry count and total bytes. When
+    `directory` is set, every rendered PDF is also written there and looked
+    up on a memory miss, so renders survive restarts and are shared between
+    processes on the same host. Disk I/O runs in a thread, and a failed
+    write only costs the disk copy.
+
+    The directory is kept within `disk_max_bytes` (default: `max_bytes`)
+    by `sweep()`, which `start()` runs every `sweep_interval` seconds: it
+    deletes expired PDFs and stale temp files, then the oldest PDFs until
+    the rest fits. Expired files found by a lookup are deleted right away.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        directory: str | None = None,
+        disk_max_bytes: int | None = None,
+        sweep_interval: float = 300,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory) if directory else None
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else max_bytes
+        self.sweep_interval = sweep_interval
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._sweeper: asyncio.Task | None = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_write_errors = 0
+        self.disk_evictions = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, data = entry
+            if time.monotonic() - stored_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self._remove(key)
+
+        found = await asyncio.to_thread(self._read_disk, key) if self.directory else None
+        if found is not None:
+            age, data = found
+            self.disk_hits += 1
+            # Keep the file's age, so promotion doesn't extend the TTL
+            self._store(key, data, stored_at=time.monotonic() - age)
+            return data
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, data: bytes) -> None:
+        self._store(key, data)
+        if self.directory is None:
+            return
+        try:
+            await asyncio.to_thread(self._write_disk, key, data)
+        except OSError:
+            self.disk_write_errors += 1
+            logger.warning("Could not write %s to the PDF cache directory", key, exc_info=True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _store(self, key: str, data: bytes, stored_at: float | None = None) -> None:
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() if stored_at is None else stored_at, data)
+        self._bytes += len(data)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str) -> None:
+        _, data = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def _read_disk(self, key: str) -> tuple[float, bytes] | None:
+        """The file's age in seconds and its content, unless it is missing or expired."""
+        path = self.directory / f"{key}.pdf"
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age >= self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return age, path.read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so readers never see a partial PDF.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, self.directory / f"{key}.pdf")
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def sweep(self) -> None:
+        """Bring the directory back within TTL and `disk_max_bytes`. Blocking."""
+        if self.directory is None:
+            return
+        now = time.time()
+        files = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            age = now - stat.st_mtime
+            if entry.name.endswith(".tmp"):
+                if age >= STALE_TMP_SECONDS:
+                    self._unlink(entry.path)
+            elif entry.name.endswith(".pdf"):
+                if age >= self.ttl_seconds:
+                    self._unlink(entry.path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    def _unlink(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        self.disk_evictions += 1
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except OSError:
+                logger.warning("PDF cache directory sweep failed", exc_info=True)
+            await asyncio.sleep(self.sweep_interval)
+
+    def start(self) -> None:
+        """Sweep the directory now and then every `sweep_interval` seconds."""
+        if self.directory is None or self._sweeper is not None:
+            return
+        self._sweeper = asyncio.create_task(self._run_sweeper())
+
+    def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "disk_write_errors": self.disk_write_errors,
+            "disk_evictions": self.disk_evictions,
+        }
+
+
+profile_pdf_cache = RenderCache(
+    max_entries=settings.PDF_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PDF_CACHE_MAX_BYTES,
+    ttl_seconds=settings.PDF_CACHE_TTL_SECONDS,
+    directory=settings.PDF_CACHE_DIR,
+    disk_max_bytes=settings.PDF_CACHE_DIR_MAX_BYTES,
+    sweep_interval=settings.PDF_CACHE_SWEEP_INTERVAL_SECONDS,
+)
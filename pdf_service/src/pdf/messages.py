@@ -0,0 +1,43 @@
+import base64
+import json
+
+from pdf_service.src.pdf.service import generate_user_pdf
+
+# 1: {"user_id", "email", "pdf"}, the rendered PDF base64-encoded in the message
+# 2: {"version", "user_id", "email", "name", "surname", "date_of_birthday"}, rendered by the worker
+MESSAGE_VERSION = 2
+
+
+class UnprocessableMessage(ValueError):
+    """A message that fails the same way on every delivery, so retrying it is pointless."""
+
+
+def build_save_message(user_id: str, fields: dict) -> str:
+    """SQS body asking the worker to render a profile PDF and store it in S3."""
+    return json.dumps({"version": MESSAGE_VERSION, "user_id": user_id, **fields})
+
+
+def pdf_from_message(body: dict) -> bytes:
+    """
+    Get the PDF a save message refers to.
+
+    Version 1 messages (no `version` field) still carry the rendered PDF,
+    so messages queued before a rollout keep working. Raises
+    `UnprocessableMessage` for unknown versions and profiles that can't be
+    rendered.
+    """
+    version = body.get("version", 1)
+    if version == 1:
+        return base64.b64decode(body["pdf"])
+    if version == 2:
+        try:
+            return generate_user_pdf(
+                name=body.get("name", ""),
+                surname=body.get("surname", ""),
+                email=body.get("email", ""),
+                date_of_birthday=body.get("date_of_birthday", ""),
+            )
+        except ValueError as exc:
+            # Rendering is deterministic; a redelivery would fail again
+            raise UnprocessableMessage(f"Cannot render profile PDF: {exc}") from exc
+    raise UnprocessableMessage(f"Unsupported message version: {version}")
@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from pdf_service.src.core.config import settings
+from pdf_service.src.pdf.service import (
+    generate_user_pdf,
+    get_profile_template,
+    get_styles,
+    profile_lines,
+)
+
+
+def _warm_up_worker() -> None:
+    """
+    Worker initializer: import ReportLab, build the stylesheet and compile the template.
+
+    Compiling the template runs one full Platypus layout, which also loads
+    the font metrics the fallback path needs.
+    """
+    get_styles()
+    get_profile_template()
+
+
+def _ping() -> None:
+    """Submitted once per worker at start-up so all of them are spawned before traffic arrives."""
+
+
+class PdfRenderPool:
+    """
+    Renders profile PDFs in a pool of warm worker processes.
+
+    ReportLab rendering is pure CPU work; running it inside an `async def`
+    route blocks the event loop for the whole render. With the pool,
+    renders run in parallel on separate cores and routes just `await`.
+
+    If the pool has not been started (e.g. in tests, where the lifespan
+    does not run), renders fall back to the default thread executor.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._renders = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up_worker,
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _ping) for _ in range(self.max_workers))
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def render(self, name: str, surname: str, email: str, date_of_birthday) -> bytes:
+        loop = asyncio.get_running_loop()
+        job = partial(
+            generate_user_pdf,
+            name=name,
+            surname=surname,
+            email=email,
+            date_of_birthday=date_of_birthday,
+        )
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, job)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._pending -= 1
+            self._renders += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._executor is not None,
+            "max_workers": self.max_workers,
+            "in_flight": self._pending,
+            "queue_depth": max(0, self._pending - self.max_workers),
+            "renders": self._renders,
+            "avg_latency_ms": (self._total_seconds / self._renders * 1000) if self._renders else 0.0,
+            "max_latency_ms": self._max_seconds * 1000,
+        }
+
+
+render_pool = PdfRenderPool(max_workers=settings.PDF_RENDER_WORKERS)
+
+
+async def render_profile_pdf(name: str, surname: str, email: str, date_of_birthday) -> bytes:
+    # Filling the precompiled template takes tens of microseconds, less than
+    # handing the job to a worker process, so only Platypus fallbacks go to the pool.
+    template = get_profile_template()
+    if template is not None:
+        pdf_bytes = template.render(*profile_lines(name, surname, email, date_of_birthday))
+        if pdf_bytes is not None:
+            return pdf_bytes
+    return await render_pool.render(name, surname, email, date_of_birthday)
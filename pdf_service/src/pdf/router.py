@@ -1,23 +1,29 @@
-import base64
-import json
-from io import BytesIO
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
 
-from pdf_service.src.aws.clients import get_sqs_client, get_s3_client
+from common.jwt_cache import VerifiedTokenCache
+from common.metrics import STAGE_SECONDS
+from pdf_service.src.aws.clients import generate_presigned_url, send_message
 from pdf_service.src.core.config import settings
-from pdf_service.src.pdf.service import generate_user_pdf
+from pdf_service.src.pdf.cache import profile_pdf_cache, render_key
+from pdf_service.src.pdf.messages import build_save_message
+from pdf_service.src.pdf.render_pool import render_pool, render_profile_pdf
+from pdf_service.src.pdf.single_flight import RecentResults, SingleFlight
 
 router = APIRouter(prefix="/pdf", tags=["PDF"])
 security = HTTPBearer()
+token_cache = VerifiedTokenCache(max_entries=settings.JWT_CACHE_MAX_ENTRIES)
+# Retries and double taps: identical concurrent renders share one render,
+# and repeated saves within the window share one queued message.
+render_flight = SingleFlight()
+save_dedup = RecentResults(window_seconds=settings.PDF_SAVE_DEDUP_WINDOW_SECONDS)
 
 
 def decode_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    from jose import JWTError
+
     try:
-        payload = jwt.decode(
+        payload = token_cache.decode(
             credentials.credentials,
             settings.SECRET_KEY_ACCESS,
             algorithms=[settings.JWT_SIGNING_ALGORITHM],
@@ -30,52 +36,101 @@ def decode_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         )
 
 
+def profile_fields(payload: dict) -> dict:
+    return {
+        "name": payload.get("name", ""),
+        "surname": payload.get("surname", ""),
+        "email": payload.get("email", ""),
+        "date_of_birthday": payload.get("date_of_birthday", ""),
+    }
+
+
+async def render_and_cache(fields: dict, key: str) -> bytes:
+    with STAGE_SECONDS.time("generate_user_pdf"):
+        pdf_bytes = await render_profile_pdf(**fields)
+    await profile_pdf_cache.set(key, pdf_bytes)
+    return pdf_bytes
+
+
+async def get_profile_pdf(fields: dict, key: str) -> bytes:
+    pdf_bytes = await profile_pdf_cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = await render_flight.do(key, lambda: render_and_cache(fields, key))
+    return pdf_bytes
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, as required for If-None-Match (RFC 9110, 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
 @router.get("/profile")
-async def download_profile_pdf(payload: dict = Depends(decode_token)):
-    pdf_bytes = generate_user_pdf(
-        name=payload.get("name", ""),
-        surname=payload.get("surname", ""),
-        email=payload.get("email", ""),
-        date_of_birthday=payload.get("date_of_birthday", ""),
-    )
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
+async def download_profile_pdf(
+    payload: dict = Depends(decode_token),
+    if_none_match: str | None = Header(default=None),
+):
+    fields = profile_fields(payload)
+    key = render_key(**fields)
+    # The key is computed from the token claims alone, so a matching
+    # If-None-Match is answered without touching the cache or rendering.
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=await get_profile_pdf(fields, key),
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=profile.pdf"},
+        headers={**headers, "Content-Disposition": "attachment; filename=profile.pdf"},
     )
 
 
+async def queue_save(user_id: str, fields: dict) -> str:
+    """Queue a save of the user's PDF and return a presigned URL of the object."""
+    # Only the profile fields are queued; the worker renders the PDF.
+    with STAGE_SECONDS.time("sqs.send_message"):
+        await send_message(
+            QueueUrl=settings.SQS_QUEUE_URL,
+            MessageBody=build_save_message(user_id, fields),
+        )
+
+    with STAGE_SECONDS.time("s3.generate_presigned_url"):
+        return await generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.S3_BUCKET_NAME, "Key": f"profiles/{user_id}.pdf"},
+            ExpiresIn=3600,
+        )
+
+
 @router.post("/save", summary="Send PDF to S3 via SQS")
 async def save_pdf_to_s3(payload: dict = Depends(decode_token)):
     user_id = payload.get("sub")
-    s3_key = f"profiles/{user_id}.pdf"
-
-    pdf_bytes = generate_user_pdf(
-        name=payload.get("name", ""),
-        surname=payload.get("surname", ""),
-        email=payload.get("email", ""),
-        date_of_birthday=payload.get("date_of_birthday", ""),
-    )
-    pdf_b64 = base64.b64encode(pdf_bytes).decode()
-
-    sqs = get_sqs_client()
-    sqs.send_message(
-        QueueUrl=settings.SQS_QUEUE_URL,
-        MessageBody=json.dumps({
-            "user_id": user_id,
-            "email": payload.get("email"),
-            "pdf": pdf_b64,
-        }),
-    )
-
-    s3 = get_s3_client()
-    presigned_url = s3.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": settings.S3_BUCKET_NAME, "Key": s3_key},
-        ExpiresIn=3600,
+    fields = profile_fields(payload)
+    # The same user and profile content within the window is one save;
+    # a changed profile gets a new key and is queued again.
+    presigned_url = await save_dedup.do(
+        f"{user_id}:{render_key(**fields)}", lambda: queue_save(user_id, fields)
     )
 
     return {
         "detail": "PDF queued for saving to S3",
         "s3_url": presigned_url,
     }
+
+
+@router.get("/stats", summary="Render cache, render pool, token cache and coalescing stats")
+async def pdf_stats():
+    return {
+        "render_cache": profile_pdf_cache.stats(),
+        "render_pool": render_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "render_single_flight": render_flight.stats(),
+        "save_dedup": save_dedup.stats(),
+    }
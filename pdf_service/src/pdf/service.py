@@ -1,19 +1,85 @@
+from functools import cache
 from io import BytesIO
-from reportlab.platypus import SimpleDocTemplate, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
+from xml.sax.saxutils import escape
 
+from pdf_service.src.pdf.templates import CompiledTemplate, compile_template
 
-def generate_user_pdf(name: str, surname: str, email: str, date_of_birthday) -> bytes:
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    content = [
-        Paragraph("User Profile", styles["Title"]),
-        Paragraph(f"Name: {name} {surname}", styles["Normal"]),
-        Paragraph(f"Email: {email}", styles["Normal"]),
-        Paragraph(f"Date of birth: {date_of_birthday}", styles["Normal"]),
+# ReportLab takes longer to import than the rest of the service together,
+# so it is imported by the functions below, i.e. on the first render or
+# during the lifespan warm-up (`get_profile_template`), not at import time.
+
+# Bump whenever the layout below changes, so cached renders (and their ETags) are invalidated.
+TEMPLATE_VERSION = "3"
+
+
+def profile_text_width() -> float:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+
+    # SimpleDocTemplate defaults: 1 inch margins, frame padding of 6pt on each side.
+    return A4[0] - 2 * inch - 2 * 6
+
+
+@cache
+def get_styles():
+    """The sample stylesheet is immutable here, so build it once per process."""
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    return getSampleStyleSheet()
+
+
+def profile_lines(name: str, surname: str, email: str, date_of_birthday) -> list[str]:
+    return [
+        f"Name: {name} {surname}",
+        f"Email: {email}",
+        f"Date of birth: {date_of_birthday}",
     ]
+
+
+def build_profile_pdf(lines: list[str], page_compression: int | None = None) -> bytes:
+    """Lay out and render the profile document with Platypus."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    buffer = BytesIO()
+    # invariant=True fixes the creation date and document ID, so the same
+    # input always renders to the same bytes (required for caching/ETags).
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4, invariant=True, pageCompression=page_compression
+    )
+    styles = get_styles()
+    content = [Paragraph("User Profile", styles["Title"])]
+    # The lines hold user input, which Paragraph would otherwise parse as markup
+    content += [Paragraph(escape(line), styles["Normal"]) for line in lines]
     doc.build(content)
     buffer.seek(0)
-    return buffer.getvalue()
\ No newline at end of file
+    return buffer.getvalue()
+
+
+@cache
+def get_profile_template() -> CompiledTemplate | None:
+    style = get_styles()["Normal"]
+    return compile_template(
+        build_profile_pdf,
+        lines=3,
+        font=style.fontName,
+        size=style.fontSize,
+        width=profile_text_width(),
+    )
+
+
+def generate_user_pdf(name: str, surname: str, email: str, date_of_birthday) -> bytes:
+    """
+    Render the profile PDF, filling the precompiled template when possible.
+
+    Text that the template can't reproduce exactly (long enough to wrap,
+    Paragraph markup, characters outside WinAnsi) goes through the full
+    Platypus layout instead.
+    """
+    lines = profile_lines(name, surname, email, date_of_birthday)
+    template = get_profile_template()
+    if template is not None:
+        pdf_bytes = template.render(*lines)
+        if pdf_bytes is not None:
+            return pdf_bytes
+    return build_profile_pdf(lines)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key starts `func()` as a task; callers arriving
+    while it runs await the same task and get the same result (or
+    exception). The task is shielded, so a caller that disconnects does
+    not cancel the work the others are waiting for.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+class RecentResults:
+    """
+    Single flight plus a short memory of results: repeats within `window_seconds` reuse them.
+
+    For side effects that should happen once per burst of identical
+    requests (queueing the same save twice). Failures are not remembered,
+    so the next request retries. A window of 0 only coalesces concurrent calls.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._flight = SingleFlight()
+        self._results: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.deduplicated = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        now = time.monotonic()
+        # Entries are in insertion order, so expired ones are at the front.
+        while self._results and next(iter(self._results.values()))[0] <= now:
+            self._results.popitem(last=False)
+        entry = self._results.get(key)
+        if entry is not None:
+            self.deduplicated += 1
+            return entry[1]
+
+        async def run_and_remember():
+            result = await func()
+            if self.window_seconds > 0:
+                self._results[key] = (time.monotonic() + self.window_seconds, result)
+                self._results.move_to_end(key)
+            return result
+
+        return await self._flight.do(key, run_and_remember)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def stats(self) -> dict:
+        flight = self._flight.stats()
+        return {
+            "window_seconds": self.window_seconds,
+            "remembered": len(self._results),
+            "in_flight": flight["in_flight"],
+            "executions": flight["executions"],
+            "coalesced": flight["coalesced"],
+            "deduplicated": self.deduplicated,
+        }
@@ -0,0 +1,122 @@
+import re
+
+_PLACEHOLDER = "@@LINE{}@@"
+_STREAM_HEADER = re.compile(rb"(\d+) 0 obj\n<<\n/Length (\d+)\n>>\nstream\n")
+# Same string escaping as ReportLab: \, ( and ) backslashed, non-printable and non-ASCII bytes as octal.
+_ESCAPES = str.maketrans({
+    **{chr(code): f"\\{code:03o}" for code in (*range(32), *range(127, 256))},
+    "\\": "\\\\",
+    "(": "\\(",
+    ")": "\\)",
+})
+# Paragraph would interpret these as markup/entities, so such text takes the Platypus path.
+_MARKUP_CHARS = set("<>&")
+# Control characters Paragraph doesn't treat as whitespace don't come out as
+# the octal escapes above, so they take the Platypus path too.
+_CONTROL_CHARS = {chr(code) for code in (*range(32), 127)}
+
+
+class CompiledTemplate:
+    """
+    A profile PDF laid out once by Platypus, with placeholders for the variable lines.
+
+    `compile_template` renders the real layout with one placeholder per
+    variable line and uncompressed page content, then keeps the bytes in
+    three parts: everything before the content stream, the stream itself
+    and everything after it. The content stream is the last object in a
+    ReportLab document, so a render only has to substitute the text, then
+    fix the stream `/Length` and the `startxref` offset — no layout,
+    no fonts, no object graph.
+
+    `render` returns None for text the skeleton can't reproduce exactly
+    (anything that would wrap, contains Paragraph markup or control
+    characters, or can't be encoded in WinAnsi); callers then fall back
+    to Platypus.
+    """
+
+    def __init__(
+        self, head: bytes, stream: str, tail: bytes, lines: int, font: str, size: float, width: float
+    ):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        self._string_width = stringWidth
+        self.head = head
+        self.stream = stream
+        self.tail = tail
+        self.lines = lines
+        self.font = font
+        self.size = size
+        self.width = width
+
+    def render(self, *lines: str) -> bytes | None:
+        if len(lines) != self.lines:
+            raise ValueError(f"Template expects {self.lines} lines, got {len(lines)}")
+        stream = self.stream
+        for index, line in enumerate(lines):
+            # Paragraph collapses runs of whitespace the same way
+            line = " ".join(line.split())
+            if _MARKUP_CHARS.intersection(line) or _CONTROL_CHARS.intersection(line):
+                return None
+            try:
+                encoded = line.encode("cp1252")
+            except UnicodeEncodeError:
+                return None
+            if self._string_width(line, self.font, self.size) > self.width:
+                return None
+            # The stream is kept as latin-1 text so that every byte maps to one character.
+            stream = stream.replace(
+                _PLACEHOLDER.format(index), encoded.decode("latin-1").translate(_ESCAPES)
+            )
+
+        body = stream.encode("latin-1")
+        header = b"%s%d\n>>\nstream\n" % (self.head, len(body))
+        startxref = len(header) + len(body) + len(b"endstream\nendobj\n")
+        return b"".join([
+            header,
+            body,
+            b"endstream\nendobj\n",
+            self.tail,
+            b"startxref\n%d\n%%%%EOF\n" % startxref,
+        ])
+
+
+def compile_template(
+    build, lines: int, font: str, size: float, width: float
+) -> CompiledTemplate | None:
+    """
+    Lay out a document once and turn it into a `CompiledTemplate`.
+
+    `build(lines, page_compression=...)` must return the rendered document
+    for the given line texts; `font`, `size` and `width` describe how those
+    lines are set, to detect text that would wrap.
+
+    Returns None if the output doesn't have the expected shape (content
+    stream last, each placeholder exactly once), so the fast path is simply
+    disabled instead of producing a broken PDF.
+    """
+    pdf = build([_PLACEHOLDER.format(i) for i in range(lines)], page_compression=0)
+
+    headers = list(_STREAM_HEADER.finditer(pdf))
+    xref = pdf.rfind(b"\nxref\n")
+    if len(headers) != 1 or xref == -1:
+        return None
+    header = headers[0]
+    stream_start = header.end()
+    stream_end = stream_start + int(header.group(2))
+    if pdf[stream_end:xref + 1] != b"endstream\nendobj\n":
+        return None
+
+    stream = pdf[stream_start:stream_end].decode("latin-1")
+    if any(stream.count(_PLACEHOLDER.format(i)) != 1 for i in range(lines)):
+        return None
+
+    trailer_end = pdf.rfind(b"startxref\n")
+    return CompiledTemplate(
+        head=pdf[:header.start(2)],
+        stream=stream,
+        tail=pdf[xref + 1:trailer_end],
+        lines=lines,
+        font=font,
+        size=size,
+        width=width,
+    )
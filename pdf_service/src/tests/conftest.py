@@ -0,0 +1,71 @@
+import os
+
+os.environ.setdefault("AWS_ENDPOINT_URL", "http://localhost:4566")
+os.environ.setdefault("SQS_QUEUE_URL", "http://localhost:4566/000000000000/pdf-queue")
+os.environ.setdefault("S3_BUCKET_NAME", "pdf-bucket")
+
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+from httpx import AsyncClient, ASGITransport  # noqa: E402
+from jose import jwt  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+from pdf_service.src.aws import clients  # noqa: E402
+
+from pdf_service.src.core.config import settings  # noqa: E402
+from pdf_service.src.main import app  # noqa: E402
+from pdf_service.src.pdf.cache import profile_pdf_cache  # noqa: E402
+from pdf_service.src.pdf.router import save_dedup  # noqa: E402
+
+PROFILE = {
+    "sub": "1",
+    "email": "john@example.com",
+    "name": "John",
+    "surname": "Doe",
+    "date_of_birthday": "1990-01-15",
+    "type": "access",
+}
+
+
+def make_token(**claims) -> str:
+    return jwt.encode(
+        {**PROFILE, **claims}, settings.SECRET_KEY_ACCESS, algorithm=settings.JWT_SIGNING_ALGORITHM
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_render_cache():
+    profile_pdf_cache.clear()
+    save_dedup.clear()
+    yield
+    profile_pdf_cache.clear()
+    save_dedup.clear()
+
+
+@pytest.fixture
+def auth_headers() -> dict:
+    return {"Authorization": f"Bearer {make_token()}"}
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """In-memory SQS queue and S3 bucket (moto) behind the shared AWS clients."""
+    # Neither the settings nor boto3 itself should point at the LocalStack endpoint
+    monkeypatch.delenv("AWS_ENDPOINT_URL")
+    monkeypatch.setattr(settings, "AWS_ENDPOINT_URL", None)
+    clients.close_clients()
+    with mock_aws():
+        sqs, s3 = clients.get_sqs_client(), clients.get_s3_client()
+        queue_url = sqs.create_queue(QueueName="pdf-queue")["QueueUrl"]
+        monkeypatch.setattr(settings, "SQS_QUEUE_URL", queue_url)
+        s3.create_bucket(Bucket=settings.S3_BUCKET_NAME)
+        yield sqs, s3
+        clients.close_clients()
@@ -0,0 +1,25 @@
+import pytest
+
+from pdf_service.src.aws import clients
+from pdf_service.src.core.config import settings
+
+
+def test_clients_are_created_once_per_process(aws):
+    assert clients.get_sqs_client() is clients.get_sqs_client()
+    assert clients.get_s3_client() is clients.get_s3_client()
+    assert clients.get_s3_client().meta.config.max_pool_connections == settings.AWS_MAX_POOL_CONNECTIONS
+
+
+@pytest.mark.asyncio
+async def test_async_wrappers(aws):
+    sqs, s3 = aws
+
+    await clients.put_object(Bucket=settings.S3_BUCKET_NAME, Key="profiles/1.pdf", Body=b"%PDF")
+    await clients.send_message(QueueUrl=settings.SQS_QUEUE_URL, MessageBody="{}")
+    url = await clients.generate_presigned_url(
+        "get_object", Params={"Bucket": settings.S3_BUCKET_NAME, "Key": "profiles/1.pdf"}
+    )
+
+    assert s3.get_object(Bucket=settings.S3_BUCKET_NAME, Key="profiles/1.pdf")["Body"].read() == b"%PDF"
+    assert len(sqs.receive_message(QueueUrl=settings.SQS_QUEUE_URL)["Messages"]) == 1
+    assert "profiles/1.pdf" in url
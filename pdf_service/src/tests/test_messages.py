@@ -0,0 +1,65 @@
+import base64
+import json
+
+import pytest
+from httpx import AsyncClient
+from unittest.mock import patch
+
+from pdf_service.src.core.config import settings
+from pdf_service.src.pdf.messages import UnprocessableMessage, build_save_message, pdf_from_message
+from pdf_service.src.pdf.service import generate_user_pdf
+
+FIELDS = {
+    "name": "John",
+    "surname": "Doe",
+    "email": "john@example.com",
+    "date_of_birthday": "1990-01-15",
+}
+
+
+def test_v2_message_is_rendered_by_the_worker():
+    body = json.loads(build_save_message("1", FIELDS))
+
+    assert "pdf" not in body
+    assert pdf_from_message(body) == generate_user_pdf(**FIELDS)
+
+
+def test_v1_message_with_embedded_pdf_is_still_accepted():
+    body = {"user_id": "1", "email": "john@example.com", "pdf": base64.b64encode(b"%PDF-1.4").decode()}
+
+    assert pdf_from_message(body) == b"%PDF-1.4"
+
+
+def test_unknown_message_version_is_rejected():
+    with pytest.raises(UnprocessableMessage):
+        pdf_from_message({"version": 99, "user_id": "1"})
+
+
+@pytest.mark.asyncio
+async def test_save_queues_profile_fields_without_rendering(
+    client: AsyncClient, auth_headers: dict, aws
+):
+    sqs, _ = aws
+    with patch("pdf_service.src.pdf.router.render_profile_pdf") as render:
+        response = await client.post("/api/v1/pdf/save", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert "/profiles/1.pdf" in response.json()["s3_url"]
+    render.assert_not_called()
+    message = sqs.receive_message(QueueUrl=settings.SQS_QUEUE_URL)["Messages"][0]
+    assert json.loads(message["Body"]) == {"version": 2, "user_id": "1", **FIELDS}
+
+
+@pytest.mark.asyncio
+async def test_repeated_saves_queue_one_message(client: AsyncClient, auth_headers: dict, aws):
+    sqs, _ = aws
+    responses = [await client.post("/api/v1/pdf/save", headers=auth_headers) for _ in range(3)]
+
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.json()["s3_url"] for response in responses}) == 1
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=settings.SQS_QUEUE_URL, AttributeNames=["ApproximateNumberOfMessages"]
+    )["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "1"
+    stats = (await client.get("/api/v1/pdf/stats")).json()["save_dedup"]
+    assert stats["deduplicated"] == 2
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+from unittest.mock import patch
+
+from pdf_service.src.pdf.cache import RenderCache, profile_pdf_cache
+from pdf_service.src.pdf.render_pool import PdfRenderPool
+from pdf_service.src.pdf.router import token_cache
+
+
+@pytest.mark.asyncio
+async def test_profile_pdf_has_strong_etag(client: AsyncClient, auth_headers: dict):
+    response = await client.get("/api/v1/pdf/profile", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+@pytest.mark.asyncio
+async def test_repeat_download_is_served_from_cache(client: AsyncClient, auth_headers: dict):
+    first = await client.get("/api/v1/pdf/profile", headers=auth_headers)
+    with patch("pdf_service.src.pdf.router.render_profile_pdf") as render:
+        second = await client.get("/api/v1/pdf/profile", headers=auth_headers)
+
+    render.assert_not_called()
+    assert second.content == first.content
+    assert profile_pdf_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_returns_304(client: AsyncClient, auth_headers: dict):
+    etag = (await client.get("/api/v1/pdf/profile", headers=auth_headers)).headers["etag"]
+
+    response = await client.get(
+        "/api/v1/pdf/profile", headers={**auth_headers, "If-None-Match": f"W/{etag}"}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_render_cache_evicts_and_uses_disk_tier(tmp_path):
+    cache = RenderCache(max_entries=2, max_bytes=1024, ttl_seconds=60, directory=str(tmp_path))
+    for key in ("a", "b", "c"):
+        await cache.set(key, key.encode() * 10)
+
+    assert cache.stats()["entries"] == 2
+    assert await cache.get("a") == b"a" * 10
+    assert cache.stats()["disk_hits"] == 1
+
+    expired = RenderCache(max_entries=2, max_bytes=1024, ttl_seconds=0)
+    await expired.set("a", b"data")
+    assert await expired.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_render_cache_promoted_entry_keeps_its_expiry(tmp_path, monkeypatch):
+    cache = RenderCache(max_entries=2, max_bytes=1024, ttl_seconds=60, directory=str(tmp_path))
+    await cache.set("a", b"data")
+    os.utime(tmp_path / "a.pdf", (time.time() - 50, time.time() - 50))
+    cache.clear()
+
+    assert await cache.get("a") == b"data"
+    assert cache.stats()["disk_hits"] == 1
+
+    # Past the file's original expiry, the promoted entry is gone from memory too
+    (tmp_path / "a.pdf").unlink()
+    monotonic = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic + 11)
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_render_cache_deletes_expired_files_on_lookup(tmp_path):
+    cache = RenderCache(max_entries=2, max_bytes=1024, ttl_seconds=0, directory=str(tmp_path))
+    await cache.set("a", b"data")
+    cache.clear()
+
+    assert await cache.get("a") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_render_cache_sweep_bounds_the_directory(tmp_path):
+    cache = RenderCache(
+        max_entries=10, max_bytes=1024, ttl_seconds=60, directory=str(tmp_path), disk_max_bytes=25
+    )
+    for age, key in enumerate(("c", "b", "a")):
+        await cache.set(key, key.encode() * 10)
+        os.utime(tmp_path / f"{key}.pdf", (time.time() - age * 10, time.time() - age * 10))
+    leftover = tmp_path / "failed.tmp"
+    leftover.write_bytes(b"partial")
+    os.utime(leftover, (time.time() - 3600, time.time() - 3600))
+
+    cache.sweep()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.pdf", "c.pdf"]
+    assert cache.stats()["disk_evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_render_cache_disk_write_failure_keeps_the_render(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_bytes(b"")
+    cache = RenderCache(max_entries=2, max_bytes=1024, ttl_seconds=60, directory=str(blocker))
+
+    await cache.set("a", b"data")
+
+    assert await cache.get("a") == b"data"
+    assert cache.stats()["disk_write_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_render_pool_renders_in_worker_process():
+    pool = PdfRenderPool(max_workers=1)
+    await pool.start()
+    try:
+        pdf_bytes = await pool.render("John", "Doe", "john@example.com", "1990-01-15")
+    finally:
+        pool.shutdown()
+
+    assert pdf_bytes.startswith(b"%PDF")
+    assert pool.stats()["renders"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_token_is_verified_once(client: AsyncClient, auth_headers: dict):
+    token_cache.clear()
+    before = token_cache.stats()
+
+    for _ in range(3):
+        response = await client.get("/api/v1/pdf/profile", headers=auth_headers)
+        assert response.status_code == 200
+
+    after = token_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_render_stage(client: AsyncClient, auth_headers: dict):
+    await client.get("/api/v1/pdf/profile", headers=auth_headers)
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'stage_duration_seconds_count{stage="generate_user_pdf"}' in response.text
+    assert 'http_request_duration_seconds_count{route="/api/v1/pdf/profile"}' in response.text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_renders_share_one_render(
+    client: AsyncClient, auth_headers: dict
+):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_render(**fields):
+        started.set()
+        await release.wait()
+        return b"%PDF-shared"
+
+    with patch("pdf_service.src.pdf.router.render_profile_pdf", side_effect=slow_render) as render:
+        requests = [
+            asyncio.create_task(client.get("/api/v1/pdf/profile", headers=auth_headers))
+            for _ in range(5)
+        ]
+        await started.wait()
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+    assert render.call_count == 1
+    assert {response.content for response in responses} == {b"%PDF-shared"}
+    stats = (await client.get("/api/v1/pdf/stats")).json()["render_single_flight"]
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
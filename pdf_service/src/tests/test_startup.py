@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+# Imported by the code paths that need them or by the lifespan warm-up
+DEFERRED = ("reportlab", "boto3", "botocore", "jose")
+
+
+def test_importing_the_app_defers_heavy_libraries():
+    code = (
+        "import sys\n"
+        "import pdf_service.src.main\n"
+        f"print(' '.join(name for name in {DEFERRED!r} if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,47 @@
+import pytest
+
+from pdf_service.src.pdf.service import (
+    build_profile_pdf,
+    generate_user_pdf,
+    get_profile_template,
+    profile_lines,
+)
+
+
+@pytest.mark.parametrize(
+    "name, surname, email, templated",
+    [
+        ("John", "Doe", "john@example.com", True),
+        ("José", "Ñandú (jr) €", "back\\slash@example.com", True),
+        ("  John ", "  Doe ", "john@example.com", True),
+        ("Tab\tbed", "Doe", "john@example.com", True),
+        # Platypus doesn't render these as the octal escapes the template would write
+        ("\x01ctl", "Doe", "john@example.com", False),
+        ("John", "Doe\x7f", "john@example.com", False),
+    ],
+)
+def test_template_matches_platypus_output(name, surname, email, templated):
+    lines = profile_lines(name, surname, email, "1990-01-15")
+
+    rendered = get_profile_template().render(*lines)
+
+    if templated:
+        assert rendered == build_profile_pdf(lines, page_compression=0)
+    else:
+        assert rendered is None
+        assert generate_user_pdf(name, surname, email, "1990-01-15") == build_profile_pdf(lines)
+
+
+@pytest.mark.parametrize(
+    "name, email",
+    [
+        ("John", "x" * 200 + "@example.com"),
+        ("<b>John</b>", "john@example.com"),
+        ("Жанна", "john@example.com"),
+    ],
+)
+def test_template_falls_back_to_platypus(name, email):
+    lines = profile_lines(name, "Doe", email, "1990-01-15")
+
+    assert get_profile_template().render(*lines) is None
+    assert generate_user_pdf(name, "Doe", email, "1990-01-15") == build_profile_pdf(lines)
@@ -0,0 +1,225 @@
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from pdf_service import worker
+from pdf_service.src.core.config import settings
+from pdf_service.src.pdf.messages import build_save_message
+from pdf_service.src.pdf.service import generate_user_pdf
+from pdf_service.supervisor import Supervisor, desired_processes
+from pdf_service.worker import VisibilityExtender, WorkerMetrics
+
+FIELDS = {
+    "name": "John",
+    "surname": "Doe",
+    "email": "john@example.com",
+    "date_of_birthday": "1990-01-15",
+}
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def queue_messages(sqs, user_ids):
+    for user_id in user_ids:
+        sqs.send_message(
+            QueueUrl=settings.SQS_QUEUE_URL, MessageBody=build_save_message(str(user_id), FIELDS)
+        )
+
+
+def queued(sqs) -> int:
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=settings.SQS_QUEUE_URL,
+        AttributeNames=["ApproximateNumberOfMessages", "ApproximateNumberOfMessagesNotVisible"],
+    )["Attributes"]
+    return sum(int(value) for value in attributes.values())
+
+
+def test_poll_saves_a_batch_and_deletes_it(aws, executor):
+    sqs, s3 = aws
+    queue_messages(sqs, range(10))
+
+    assert worker.poll_once(sqs, s3, executor, wait_time_seconds=0) == 10
+
+    keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)["Contents"]}
+    assert keys == {f"profiles/{user_id}.pdf" for user_id in range(10)}
+    assert queued(sqs) == 0
+
+
+def test_failed_upload_is_left_on_the_queue(aws, executor):
+    sqs, s3 = aws
+    queue_messages(sqs, range(3))
+    put_object = s3.put_object
+
+    def flaky_put_object(**kwargs):
+        if kwargs["Key"] == "profiles/1.pdf":
+            raise RuntimeError("S3 unavailable")
+        return put_object(**kwargs)
+
+    with patch.object(s3, "put_object", side_effect=flaky_put_object):
+        assert worker.poll_once(sqs, s3, executor, wait_time_seconds=0) == 2
+
+    assert queued(sqs) == 1
+
+
+def test_unrenderable_message_is_deleted(aws, executor):
+    sqs, s3 = aws
+    queue_messages(sqs, range(3))
+
+    def failing_render(**fields):
+        if fields["name"] == "Bad":
+            raise ValueError("paraparser: syntax error")
+        return generate_user_pdf(**fields)
+
+    sqs.send_message(
+        QueueUrl=settings.SQS_QUEUE_URL,
+        MessageBody=build_save_message("3", {**FIELDS, "name": "Bad"}),
+    )
+    with patch("pdf_service.src.pdf.messages.generate_user_pdf", side_effect=failing_render):
+        assert worker.poll_once(sqs, s3, executor, wait_time_seconds=0) == 3
+
+    # Redelivering it would only fail again, so it is not left on the queue
+    assert queued(sqs) == 0
+    assert s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)["KeyCount"] == 3
+
+
+def test_partial_delete_failure_is_reported(aws, executor):
+    sqs, s3 = aws
+    queue_messages(sqs, range(2))
+    messages = sqs.receive_message(QueueUrl=settings.SQS_QUEUE_URL, MaxNumberOfMessages=10)["Messages"]
+
+    with patch.object(
+        sqs,
+        "delete_message_batch",
+        return_value={
+            "Successful": [{"Id": messages[0]["MessageId"]}],
+            "Failed": [{"Id": messages[1]["MessageId"], "Code": "ReceiptHandleIsInvalid"}],
+        },
+    ):
+        assert worker.process_batch(sqs, s3, messages, executor) == 1
+
+    # Both uploads happened; only the acknowledgement of one of them failed
+    assert s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)["KeyCount"] == 2
+
+
+def idle_worker(metrics_queue):
+    # Stands in for `worker.run_worker` in supervisor tests: waits for SIGTERM, then exits
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    stop.wait()
+
+
+@pytest.mark.parametrize(
+    ("current", "depth", "age", "expected"),
+    [
+        (1, 0, 0, 1),  # never below the minimum
+        (1, 250, 0, 3),  # straight up to what the backlog needs
+        (2, 50, 120, 3),  # old messages add a process even with a small backlog
+        (4, 0, 0, 3),  # down one process at a time
+        (4, 5000, 0, 4),  # never above the maximum
+    ],
+)
+def test_desired_processes(current, depth, age, expected):
+    assert (
+        desired_processes(
+            current,
+            depth,
+            age,
+            min_processes=1,
+            max_processes=4,
+            backlog_per_process=100,
+            max_message_age=60,
+        )
+        == expected
+    )
+
+
+def test_metrics_report_lag_of_the_oldest_message():
+    metrics = WorkerMetrics()
+    sent = int((time.time() - 30) * 1000)
+    messages = [
+        {"Attributes": {"SentTimestamp": str(sent)}},
+        {"Attributes": {"SentTimestamp": str(sent + 20_000)}},
+    ]
+
+    metrics.record_batch(messages, saved=1)
+
+    stats = metrics.stats()
+    assert 29 < stats["lag_seconds"] < 32
+    assert stats["processed"] == 1
+    assert stats["failed"] == 1
+    metrics.record_empty_poll()
+    assert metrics.stats()["lag_seconds"] == 0
+    assert metrics.stats()["max_lag_seconds"] > 29
+
+
+def test_supervisor_serves_metrics_reported_by_workers(aws, executor):
+    sqs, _ = aws
+    queue_messages(sqs, range(3))
+    metrics = WorkerMetrics()
+    worker.poll_once(sqs, aws[1], executor, wait_time_seconds=0, metrics=metrics)
+    supervisor = Supervisor(sqs)
+
+    worker.report(metrics, supervisor.metrics_queue)
+    time.sleep(0.1)
+    supervisor.collect_metrics()
+
+    text = supervisor.metrics_text()
+    pid = metrics.stats()["pid"]
+    assert f'pdf_saver_messages_processed{{pid="{pid}"}} 3' in text
+    assert 'stage_duration_seconds_count{stage="s3.put_object"}' in text
+    assert 'stage_duration_seconds_count{stage="sqs.receive_message"}' in text
+
+
+def test_visibility_is_extended_while_a_batch_is_processed(aws):
+    sqs, _ = aws
+    queue_messages(sqs, range(2))
+    messages = sqs.receive_message(
+        QueueUrl=settings.SQS_QUEUE_URL, MaxNumberOfMessages=10, VisibilityTimeout=1
+    )["Messages"]
+
+    with VisibilityExtender(sqs, messages, timeout=1):
+        time.sleep(1.5)
+        # Without the extension both messages would be visible again by now
+        assert sqs.receive_message(QueueUrl=settings.SQS_QUEUE_URL).get("Messages") is None
+
+
+def test_listen_drains_the_current_batch_on_stop(aws, monkeypatch):
+    sqs, s3 = aws
+    monkeypatch.setattr(worker, "WAIT_TIME_SECONDS", 0)
+    queue_messages(sqs, range(25))
+    stop = threading.Event()
+    thread = threading.Thread(target=worker.listen, args=(stop,))
+    thread.start()
+
+    while queued(sqs):
+        time.sleep(0.05)
+    stop.set()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert s3.list_objects_v2(Bucket=settings.S3_BUCKET_NAME)["KeyCount"] == 25
+
+
+def test_supervisor_scales_with_queue_depth(aws):
+    sqs, _ = aws
+    supervisor = Supervisor(sqs, min_processes=1, max_processes=4, target=idle_worker)
+    try:
+        queue_messages(sqs, range(250))
+        assert supervisor.step() == 3
+        assert all(process.is_alive() for process in supervisor.processes)
+
+        sqs.purge_queue(QueueUrl=settings.SQS_QUEUE_URL)
+        assert supervisor.step() == 2
+        assert len(supervisor.draining) == 1
+    finally:
+        supervisor.shutdown(timeout=10)
+
+    assert not supervisor.processes and not supervisor.draining
@@ -0,0 +1,180 @@
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+from common.metrics import merge, render, start_http_server
+from pdf_service import worker
+from pdf_service.src.aws.clients import get_sqs_client
+from pdf_service.src.core.config import settings
+
+MIN_PROCESSES = int(os.getenv("WORKER_MIN_PROCESSES", "1"))
+MAX_PROCESSES = int(os.getenv("WORKER_MAX_PROCESSES", str(os.cpu_count() or 1)))
+# Visible messages one process is expected to keep up with
+BACKLOG_PER_PROCESS = int(os.getenv("WORKER_BACKLOG_PER_PROCESS", "100"))
+# Add a process whenever the oldest message waited longer than this
+MAX_MESSAGE_AGE = float(os.getenv("WORKER_MAX_MESSAGE_AGE", "60"))
+SCALE_INTERVAL = float(os.getenv("WORKER_SCALE_INTERVAL", "10"))
+# How long a stopping process may take to finish its batch before it is killed
+DRAIN_TIMEOUT = float(os.getenv("WORKER_DRAIN_TIMEOUT", "60"))
+
+
+def desired_processes(
+    current: int,
+    queue_depth: int,
+    oldest_age: float,
+    *,
+    min_processes: int = MIN_PROCESSES,
+    max_processes: int = MAX_PROCESSES,
+    backlog_per_process: int = BACKLOG_PER_PROCESS,
+    max_message_age: float = MAX_MESSAGE_AGE,
+) -> int:
+    """
+    Number of consumer processes to run for the current backlog.
+
+    Scales up straight to what the backlog needs, and by at least one more
+    process while messages are older than `max_message_age`. Scales down one
+    process per interval, so a short lull doesn't stop workers that will be
+    needed again a moment later.
+    """
+    desired = math.ceil(queue_depth / backlog_per_process)
+    if oldest_age > max_message_age:
+        desired = max(desired, current + 1)
+    elif desired < current:
+        desired = current - 1
+    return max(min_processes, min(max_processes, desired))
+
+
+class Supervisor:
+    """
+    Runs `worker.run_worker` in several processes and scales them with the queue.
+
+    Every `interval` seconds it reads `ApproximateNumberOfMessages` from SQS
+    and the lag the workers report (SQS itself doesn't expose the age of
+    the oldest message outside CloudWatch), then starts or stops processes
+    to match `desired_processes`. Stopped processes get SIGTERM and drain
+    their current batch; processes that die unexpectedly are replaced on
+    the next interval.
+    """
+
+    def __init__(
+        self,
+        sqs,
+        min_processes: int = MIN_PROCESSES,
+        max_processes: int = MAX_PROCESSES,
+        interval: float = SCALE_INTERVAL,
+        target=worker.run_worker,
+    ):
+        self.sqs = sqs
+        self.min_processes = min_processes
+        self.max_processes = max_processes
+        self.interval = interval
+        self.target = target
+        self._context = multiprocessing.get_context("spawn")
+        self.metrics_queue = self._context.Queue()
+        self.processes: list[multiprocessing.Process] = []
+        self.draining: list[multiprocessing.Process] = []
+        self.worker_stats: dict[int, dict] = {}
+        self.stop = threading.Event()
+
+    def queue_depth(self) -> int:
+        attributes = self.sqs.get_queue_attributes(
+            QueueUrl=settings.SQS_QUEUE_URL,
+            AttributeNames=["ApproximateNumberOfMessages"],
+        )["Attributes"]
+        return int(attributes["ApproximateNumberOfMessages"])
+
+    def oldest_message_age(self) -> float:
+        return max((stats["lag_seconds"] for stats in self.worker_stats.values()), default=0.0)
+
+    def collect_metrics(self) -> None:
+        while True:
+            try:
+                stats = self.metrics_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.worker_stats[stats["pid"]] = stats
+
+    def metrics_text(self) -> str:
+        """Metrics of all live workers as of their last report, merged into one exposition."""
+        return render(merge([
+            stats["metrics"] for stats in list(self.worker_stats.values()) if "metrics" in stats
+        ]))
+
+    def reap(self) -> None:
+        for process in self.processes[:]:
+            if not process.is_alive():
+                print(f"pdf_saver {process.pid} exited with code {process.exitcode}")
+                self.processes.remove(process)
+                self.worker_stats.pop(process.pid, None)
+        for process in self.draining[:]:
+            if not process.is_alive():
+                self.draining.remove(process)
+                self.worker_stats.pop(process.pid, None)
+
+    def scale_to(self, count: int) -> None:
+        while len(self.processes) < count:
+            process = self._context.Process(target=self.target, args=(self.metrics_queue,))
+            process.start()
+            self.processes.append(process)
+        while len(self.processes) > count:
+            process = self.processes.pop()
+            process.terminate()
+            self.draining.append(process)
+
+    def step(self) -> int:
+        self.collect_metrics()
+        self.reap()
+        depth = self.queue_depth()
+        age = self.oldest_message_age()
+        count = desired_processes(
+            len(self.processes),
+            depth,
+            age,
+            min_processes=self.min_processes,
+            max_processes=self.max_processes,
+        )
+        if count != len(self.processes):
+            print(
+                f"pdf_saver supervisor: scaling {len(self.processes)} -> {count} "
+                f"(queue depth {depth}, oldest message {age:.1f}s)"
+            )
+        self.scale_to(count)
+        return count
+
+    def run(self) -> None:
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: self.stop.set())
+        self.scale_to(self.min_processes)
+        while not self.stop.wait(self.interval):
+            try:
+                self.step()
+            except Exception as exc:
+                print(f"pdf_saver supervisor: scaling failed: {exc!r}")
+        self.shutdown()
+
+    def shutdown(self, timeout: float = DRAIN_TIMEOUT) -> None:
+        """SIGTERM every process, give them `timeout` seconds to drain, then kill the rest."""
+        self.scale_to(0)
+        deadline = time.monotonic() + timeout
+        for process in self.draining:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                print(f"pdf_saver {process.pid} did not drain in time, killing it")
+                process.kill()
+                process.join()
+        self.draining.clear()
+        self.collect_metrics()
+
+
+def supervise() -> None:
+    supervisor = Supervisor(get_sqs_client())
+    if worker.METRICS_PORT:
+        start_http_server(worker.METRICS_PORT, supervisor.metrics_text)
+    print(
+        f"pdf_saver supervisor: {supervisor.min_processes}-{supervisor.max_processes} processes"
+    )
+    supervisor.run()
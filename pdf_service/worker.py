@@ -1,56 +1,283 @@
+import argparse
 import json
-import base64
+import signal
+import threading
 import time
-import boto3
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-AWS_ENDPOINT = os.getenv("AWS_ENDPOINT_URL", "http://localstack:4566")
-SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
-S3_BUCKET = os.getenv("S3_BUCKET_NAME", "pdf-bucket")
-
-def get_client(service):
-    return boto3.client(
-        service,
-        endpoint_url=AWS_ENDPOINT,
-        region_name="us-east-1",
-        aws_access_key_id="test",
-        aws_secret_access_key="test",
-    )
+from common.metrics import REGISTRY, STAGE_SECONDS, start_http_server
+from pdf_service.src.aws.clients import get_s3_client, get_sqs_client
+from pdf_service.src.core.config import settings
+from pdf_service.src.pdf.messages import UnprocessableMessage, pdf_from_message
+
+# SQS returns at most 10 messages per receive and deletes at most 10 per batch
+RECEIVE_BATCH_SIZE = 10
+# Uploads in flight at once; keep AWS_MAX_POOL_CONNECTIONS at least this large
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "10"))
+WAIT_TIME_SECONDS = int(os.getenv("WORKER_WAIT_TIME_SECONDS", "5"))
+# Received messages stay invisible this long and are extended while still being processed
+VISIBILITY_TIMEOUT = int(os.getenv("WORKER_VISIBILITY_TIMEOUT", "30"))
+METRICS_INTERVAL = int(os.getenv("WORKER_METRICS_INTERVAL", "10"))
+# /metrics of the worker, or of the supervisor with --supervise (0 disables it)
+METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "9100"))
+
+# Reported by `report()`, one series per worker process
+PROCESSED = REGISTRY.gauge("pdf_saver_messages_processed", "Messages saved and deleted", "pid")
+FAILED = REGISTRY.gauge("pdf_saver_messages_failed", "Messages left on the queue after a failure", "pid")
+THROUGHPUT = REGISTRY.gauge(
+    "pdf_saver_messages_per_second", "Messages saved per second over the last minute", "pid"
+)
+LAG = REGISTRY.gauge("pdf_saver_lag_seconds", "Queue time of the last batch's oldest message", "pid")
 
 def ensure_bucket():
-    s3 = get_client("s3")
+    s3 = get_s3_client()
     try:
-        s3.create_bucket(Bucket=S3_BUCKET)
-        print(f"Bucket '{S3_BUCKET}' created")
+        s3.create_bucket(Bucket=settings.S3_BUCKET_NAME)
+        print(f"Bucket '{settings.S3_BUCKET_NAME}' created")
     except Exception:
         pass  # вже існує
 
-def listen():
-    sqs = get_client("sqs")
-    s3 = get_client("s3")
-    ensure_bucket()
-    print("pdf_saver listening...")
 
-    while True:
-        response = sqs.receive_message(
-            QueueUrl=SQS_QUEUE_URL,
-            MaxNumberOfMessages=1,
-            WaitTimeSeconds=5,
+class WorkerMetrics:
+    """
+    Throughput and lag of one worker process.
+
+    Lag is the age of the oldest message in the last received batch, i.e.
+    how far behind the queue this worker is; it drops to 0 on an empty poll.
+    """
+
+    def __init__(self, window_seconds=60):
+        self.window_seconds = window_seconds
+        self.started = time.monotonic()
+        self.processed = 0
+        self.failed = 0
+        self.lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self._recent = deque()  # (monotonic time, messages saved)
+
+    def record_batch(self, messages, saved):
+        now = time.time()
+        sent = [
+            int(msg["Attributes"]["SentTimestamp"]) / 1000
+            for msg in messages
+            if "SentTimestamp" in msg.get("Attributes", {})
+        ]
+        self.lag_seconds = max(0.0, now - min(sent)) if sent else 0.0
+        self.max_lag_seconds = max(self.max_lag_seconds, self.lag_seconds)
+        self.processed += saved
+        self.failed += len(messages) - saved
+        self._recent.append((time.monotonic(), saved))
+
+    def record_empty_poll(self):
+        self.lag_seconds = 0.0
+
+    def stats(self):
+        now = time.monotonic()
+        while self._recent and now - self._recent[0][0] > self.window_seconds:
+            self._recent.popleft()
+        window = min(self.window_seconds, now - self.started) or 1
+        return {
+            "pid": os.getpid(),
+            "processed": self.processed,
+            "failed": self.failed,
+            "messages_per_second": sum(saved for _, saved in self._recent) / window,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+
+class VisibilityExtender:
+    """
+    Keeps a batch invisible on the queue while it is being processed.
+
+    Every half visibility timeout the whole batch is pushed back by another
+    `VISIBILITY_TIMEOUT` seconds, so a slow render or upload is not
+    redelivered to another worker halfway through.
+    """
+
+    def __init__(self, sqs, messages, timeout=None):
+        self.sqs = sqs
+        self.messages = messages
+        self.timeout = timeout or VISIBILITY_TIMEOUT
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._done.wait(self.timeout / 2):
+            self.extend()
+
+    def extend(self):
+        try:
+            response = self.sqs.change_message_visibility_batch(
+                QueueUrl=settings.SQS_QUEUE_URL,
+                Entries=[
+                    {
+                        "Id": msg["MessageId"],
+                        "ReceiptHandle": msg["ReceiptHandle"],
+                        "VisibilityTimeout": self.timeout,
+                    }
+                    for msg in self.messages
+                ],
+            )
+        except Exception as exc:
+            print(f"Failed to extend visibility: {exc!r}")
+            return
+        for entry in response.get("Failed", []):
+            print(f"Failed to extend visibility of {entry['Id']}: {entry.get('Code')}")
+
+
+def save_message(s3, msg):
+    """Render/decode the PDF a message refers to and upload it to S3."""
+    body = json.loads(msg["Body"])
+    with STAGE_SECONDS.time("generate_user_pdf"):
+        pdf_bytes = pdf_from_message(body)
+    key = f"profiles/{body['user_id']}.pdf"
+    with STAGE_SECONDS.time("s3.put_object"):
+        s3.put_object(Bucket=settings.S3_BUCKET_NAME, Key=key, Body=pdf_bytes)
+    return key
+
+def delete_messages(sqs, messages):
+    """
+    Acknowledge processed messages with one DeleteMessageBatch call.
+
+    Returns the ids SQS failed to delete; those messages become visible
+    again after the visibility timeout and are processed once more, which
+    is harmless because uploads overwrite the same key.
+    """
+    if not messages:
+        return []
+    with STAGE_SECONDS.time("sqs.delete_message_batch"):
+        response = sqs.delete_message_batch(
+            QueueUrl=settings.SQS_QUEUE_URL,
+            Entries=[
+                {"Id": msg["MessageId"], "ReceiptHandle": msg["ReceiptHandle"]}
+                for msg in messages
+            ],
         )
-        messages = response.get("Messages", [])
-        for msg in messages:
-            body = json.loads(msg["Body"])
-            pdf_bytes = base64.b64decode(body["pdf"])
-            key = f"profiles/{body['user_id']}.pdf"
+    failed = response.get("Failed", [])
+    for entry in failed:
+        print(f"Failed to delete message {entry['Id']}: {entry.get('Message', entry.get('Code'))}")
+    return [entry["Id"] for entry in failed]
 
-            s3.put_object(Bucket=S3_BUCKET, Key=key, Body=pdf_bytes)
+def process_batch(sqs, s3, messages, executor):
+    """
+    Upload a received batch concurrently, then delete the messages that succeeded.
+
+    A message whose upload fails is left on the queue, so SQS redelivers it
+    (and eventually moves it to a dead-letter queue if one is configured).
+    An `UnprocessableMessage` would fail on every delivery, so it is logged
+    and deleted instead of being redelivered forever.
+    Returns the number of messages saved and acknowledged.
+    """
+    done = []
+    dropped = []
+    with VisibilityExtender(sqs, messages):
+        futures = [(msg, executor.submit(save_message, s3, msg)) for msg in messages]
+        for msg, future in futures:
+            try:
+                key = future.result()
+            except UnprocessableMessage as exc:
+                print(f"Dropping message {msg['MessageId']}: {exc}")
+                dropped.append(msg)
+                continue
+            except Exception as exc:
+                print(f"Failed to save message {msg['MessageId']}: {exc!r}")
+                continue
             print(f"Saved to S3: {key}")
+            done.append(msg)
+    failed = set(delete_messages(sqs, done + dropped))
+    return sum(msg["MessageId"] not in failed for msg in done)
 
-            sqs.delete_message(
-                QueueUrl=SQS_QUEUE_URL,
-                ReceiptHandle=msg["ReceiptHandle"],
-            )
+def poll_once(sqs, s3, executor, wait_time_seconds=WAIT_TIME_SECONDS, metrics=None):
+    # Includes the long-poll wait, so an idle queue shows up as ~WAIT_TIME_SECONDS
+    with STAGE_SECONDS.time("sqs.receive_message"):
+        response = sqs.receive_message(
+            QueueUrl=settings.SQS_QUEUE_URL,
+            MaxNumberOfMessages=RECEIVE_BATCH_SIZE,
+            WaitTimeSeconds=wait_time_seconds,
+            VisibilityTimeout=VISIBILITY_TIMEOUT,
+            MessageSystemAttributeNames=["SentTimestamp"],
+        )
+    messages = response.get("Messages", [])
+    if not messages:
+        if metrics is not None:
+            metrics.record_empty_poll()
+        return 0
+    saved = process_batch(sqs, s3, messages, executor)
+    if metrics is not None:
+        metrics.record_batch(messages, saved)
+    return saved
+
+def report(metrics, metrics_queue=None):
+    """Log the stats, update the gauges and, under the supervisor, send both to it."""
+    stats = metrics.stats()
+    print(f"pdf_saver metrics {json.dumps(stats)}")
+    pid = str(stats["pid"])
+    PROCESSED.labels(pid).set(stats["processed"])
+    FAILED.labels(pid).set(stats["failed"])
+    THROUGHPUT.labels(pid).set(stats["messages_per_second"])
+    LAG.labels(pid).set(stats["lag_seconds"])
+    if metrics_queue is not None:
+        metrics_queue.put({**stats, "metrics": REGISTRY.snapshot()})
+
+def listen(stop=None, metrics_queue=None):
+    """
+    Consume the queue until `stop` is set.
+
+    Setting `stop` (SIGTERM/SIGINT in `run_worker`) lets the batch in
+    progress finish uploading and get acknowledged before returning, so a
+    drained worker leaves nothing half-processed behind.
+    """
+    stop = stop or threading.Event()
+    sqs = get_sqs_client()
+    s3 = get_s3_client()
+    ensure_bucket()
+    metrics = WorkerMetrics()
+    last_report = time.monotonic()
+    print(f"pdf_saver {os.getpid()} listening ({WORKER_CONCURRENCY} concurrent uploads)...")
+
+    with ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY) as executor:
+        while not stop.is_set():
+            poll_once(sqs, s3, executor, WAIT_TIME_SECONDS, metrics)
+            if time.monotonic() - last_report >= METRICS_INTERVAL:
+                report(metrics, metrics_queue)
+                last_report = time.monotonic()
+    report(metrics, metrics_queue)
+    print(f"pdf_saver {os.getpid()} drained")
+
+def run_worker(metrics_queue=None):
+    """Entry point of one consumer process: drain and exit on SIGTERM/SIGINT."""
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+    listen(stop, metrics_queue)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save profile PDFs queued by pdf_service to S3.")
+    parser.add_argument(
+        "--supervise",
+        action="store_true",
+        help="run several consumer processes, scaled on queue depth and message age",
+    )
+    args = parser.parse_args()
+
     time.sleep(5)
-    listen()
+    if args.supervise:
+        from pdf_service.supervisor import supervise
+
+        ensure_bucket()
+        supervise()
+    else:
+        if METRICS_PORT:
+            start_http_server(METRICS_PORT)
+        run_worker()
@@ -0,0 +1,45 @@
+"""add user listing indexes
+
+Revision ID: 5c2f8e1a9b7d
+Revises: d95ee1b4be96
+Create Date: 2026-10-18 13:40:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2f8e1a9b7d'
+down_revision: Union[str, Sequence[str], None] = 'd95ee1b4be96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but doesn't block writes
+    # to the users table while the indexes are built.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at_id', 'users', ['created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_email_prefix', 'users', [sa.text('lower(email) varchar_pattern_ops')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_surname_prefix', 'users', [sa.text('lower(surname) varchar_pattern_ops')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_surname_prefix', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_prefix', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -16,9 +18,81 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    # Read replicas as comma-separated host[:port], with the primary's credentials and database
+    POSTGRES_REPLICA_HOSTS: str = ""
+
+    @property
+    def replica_urls_async(self) -> list[str]:
+        urls = []
+        for host in filter(None, (host.strip() for host in self.POSTGRES_REPLICA_HOSTS.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.POSTGRES_PORT}"
+            urls.append(
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{host}/{self.POSTGRES_DB}"
+            )
+        return urls
+
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5
+    DB_REPLICA_CHECK_TIMEOUT_SECONDS: float = 2
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # False: no statement logging, True: log statements, "debug": also log result rows
+    DB_ECHO: bool | Literal["debug"] = False
+    # Per-connection cache of asyncpg prepared statements (0 disables it,
+    # which is required behind PgBouncer in transaction mode).
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+
     SECRET_KEY_ACCESS: str = Field(default="super-secret-key", env="SECRET_KEY_ACCESS")
     JWT_SIGNING_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verified-token cache size (0 disables it)
+    JWT_CACHE_MAX_ENTRIES: int = 10_000
+
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_ROUNDS: int = 14
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+
+    PDF_SERVICE_URL: str = "http://pdf_service:8001"
+    # Unix domain socket of a co-located pdf_service (uvicorn --uds ...)
+    PDF_SERVICE_UDS: str | None = None
+    PDF_SERVICE_HTTP2: bool = False
+    PDF_SERVICE_MAX_CONNECTIONS: int = 100
+    PDF_SERVICE_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    PDF_SERVICE_KEEPALIVE_EXPIRY: float = 30
+    PDF_SERVICE_TIMEOUT: float = 10
+    PDF_SERVICE_CONNECT_TIMEOUT: float = 2
+    # Keep-alive connections opened to pdf_service during start-up
+    PDF_SERVICE_WARM_CONNECTIONS: int = 4
+
+    ADMIN_API_KEY: str | None = None
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    # Local tier TTL: how long other processes may serve a user after it changed
+    USER_CACHE_TTL_SECONDS: float = 30
+    USER_CACHE_NEGATIVE_TTL_SECONDS: float = 5
+    # Optional shared tier, e.g. redis://redis:6379/0 (requires the redis package)
+    USER_CACHE_REDIS_URL: str | None = None
+    USER_CACHE_BACKEND_TTL_SECONDS: float = 300
+
+    PDF_EXPORT_WORKERS: int = 2
+    PDF_EXPORT_BATCH_SIZE: int = 500
+
+    # Request profiling (common/profiling.py); disabled unless a directory is set
+    PROFILE_DIR: str | None = None
+    # Value of the X-Profile header that profiles a request on demand
+    PROFILE_API_KEY: str | None = None
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 5
+    # "collapsed" (folded stacks) or "speedscope"
+    PROFILE_FORMAT: str = "collapsed"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,11 +1,40 @@
+import asyncio
+import logging
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from user_service.src.core.config import settings
+from user_service.src.core.db_pool import InstrumentedAsyncQueuePool, instrument_connects
 
-engine = create_async_engine(settings.database_url_async, echo=True)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
+    )
+    instrument_connects(engine)
+    return engine
+
+
+engine = _create_engine(settings.database_url_async)
+
+logger = logging.getLogger(__name__)
 
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
@@ -14,6 +43,139 @@ class Base(DeclarativeBase):
     pass
 
 
+class ReplicaSet:
+    """
+    Round-robin over read replicas that passed their last health check.
+
+    `start()` checks every replica and keeps re-checking them every
+    `check_interval` seconds in the background; a replica that fails a
+    check, or fails a query (`mark_down`), gets no reads until a later
+    check passes. With no replicas configured, or none healthy, `choose()`
+    returns None and reads go to the primary.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], check_interval: float, check_timeout: float):
+        self.engines = engines
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        # Optimistic until the first check, so reads spread out right away
+        self.healthy = [True] * len(engines)
+        self._next = 0
+        self._task: asyncio.Task | None = None
+        self.reads = [0] * len(engines)
+        self.primary_reads = 0
+        self.failures = 0
+
+    def choose(self) -> AsyncEngine | None:
+        for _ in range(len(self.engines)):
+            index = self._next
+            self._next = (self._next + 1) % len(self.engines)
+            if self.healthy[index]:
+                self.reads[index] += 1
+                return self.engines[index]
+        self.primary_reads += 1
+        return None
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        for index, candidate in enumerate(self.engines):
+            if candidate is replica and self.healthy[index]:
+                logger.warning("Read replica %s failed, routing its reads elsewhere", replica.url.host)
+                self.healthy[index] = False
+                self.failures += 1
+
+    async def _check(self, index: int) -> None:
+        replica = self.engines[index]
+
+        async def ping():
+            async with replica.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(ping(), self.check_timeout)
+        except Exception:
+            self.mark_down(replica)
+        else:
+            if not self.healthy[index]:
+                logger.info("Read replica %s is healthy again", replica.url.host)
+            self.healthy[index] = True
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(index) for index in range(len(self.engines))))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def start(self) -> None:
+        if not self.engines or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"host": replica.url.host, "port": replica.url.port, "healthy": healthy, "reads": reads}
+                for replica, healthy, reads in zip(self.engines, self.healthy, self.reads)
+            ],
+            "primary_reads": self.primary_reads,
+            "failures": self.failures,
+        }
+
+
+replicas = ReplicaSet(
+    [_create_engine(url) for url in settings.replica_urls_async],
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+    check_timeout=settings.DB_REPLICA_CHECK_TIMEOUT_SECONDS,
+)
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    A session for read-only work on a healthy replica, or on the primary if there is none.
+
+    Replicas lag behind the primary, so don't use it to read rows the
+    same client may have just written; see `is_replica`.
+    """
+    replica = replicas.choose()
+    if replica is None:
+        async with async_session_maker() as session:
+            yield session
+        return
+    async with async_session_maker(bind=replica, info={"replica": True}) as session:
+        yield session
+
+
+def is_replica(session: AsyncSession) -> bool:
+    return session.info.get("replica", False)
+
+
+async def warm_up_pool(connections: int = settings.DB_POOL_SIZE) -> None:
+    """
+    Open `connections` pooled connections before the first request needs them.
+
+    Holding them all at once makes the pool open that many instead of
+    reusing one. Failures are logged, not raised: the pool still connects
+    on demand once the database is reachable.
+    """
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(ping() for _ in range(connections)))
+    except Exception:
+        logger.warning("Database pool warm-up failed", exc_info=True)
@@ -0,0 +1,98 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    overflow_checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    connects: int = 0
+    connect_seconds_total: float = 0.0
+    connect_seconds_max: float = 0.0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long callers wait for a connection.
+
+    Wait time covers everything between asking the pool for a connection and
+    getting one: queueing behind other checkouts, opening a new connection
+    and the pre-ping. Stats survive `recreate()` (e.g. after `dispose()`).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - started
+
+        self.stats.checkouts += 1
+        self.stats.wait_seconds_total += elapsed
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, elapsed)
+        if self.checkedout() > self.size():
+            self.stats.overflow_checkouts += 1
+        return connection
+
+
+def instrument_connects(engine: AsyncEngine) -> None:
+    """Record the latency of opening new DBAPI connections on `engine`'s pool stats."""
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def _connect_started(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect_finished(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        stats = getattr(engine.pool, "stats", None)
+        if started is None or stats is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats.connects += 1
+        stats.connect_seconds_total += elapsed
+        stats.connect_seconds_max = max(stats.connect_seconds_max, elapsed)
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """Current pool occupancy plus the accumulated stats, with times in milliseconds."""
+    pool = engine.pool
+    status = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+    }
+    stats: PoolStats | None = getattr(pool, "stats", None)
+    if stats is None:
+        return status
+    return {
+        **status,
+        "checkouts": stats.checkouts,
+        "overflow_checkouts": stats.overflow_checkouts,
+        "timeouts": stats.timeouts,
+        "avg_wait_ms": (stats.wait_seconds_total / stats.checkouts * 1000) if stats.checkouts else 0.0,
+        "max_wait_ms": stats.wait_seconds_max * 1000,
+        "connects": stats.connects,
+        "avg_connect_ms": (stats.connect_seconds_total / stats.connects * 1000) if stats.connects else 0.0,
+        "max_connect_ms": stats.connect_seconds_max * 1000,
+    }
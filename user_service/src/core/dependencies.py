@@ -1,10 +1,14 @@
+import secrets
+
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 
+from user_service.src.core.config import settings
 from user_service.src.user.schemas import CurrentUserDTO
 from user_service.src.security.token_manager import decode_access_token
 
 security = HTTPBearer()
+admin_key_header = APIKeyHeader(name="X-Admin-Key", auto_error=False)
 
 
 async def get_current_user(
@@ -49,4 +53,24 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def require_admin(api_key: str | None = Depends(admin_key_header)) -> None:
+    """
+    Allow the request only if it carries the configured admin API key.
+
+    Admin endpoints are disabled entirely while ADMIN_API_KEY is not set.
+
+    Raises:
+        HTTPException 403: Missing or wrong admin key
+    """
+    if (
+        not settings.ADMIN_API_KEY
+        or not api_key
+        or not secrets.compare_digest(api_key, settings.ADMIN_API_KEY)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from common.metrics import STAGE_SECONDS
+from user_service.src.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Headers of an upstream response that are forwarded as-is by `stream()`.
+# Content-Encoding must travel with the body because it is relayed raw.
+PASSTHROUGH_HEADERS = (
+    "content-type",
+    "content-length",
+    "content-encoding",
+    "content-disposition",
+    "etag",
+    "cache-control",
+    "last-modified",
+)
+
+_NEW_CONNECTION_EVENTS = {
+    "connection.connect_tcp.complete",
+    "connection.connect_unix_socket.complete",
+}
+
+
+class UpstreamClient:
+    """
+    Shared, keep-alive `httpx.AsyncClient` for calls from the gateway to pdf_service.
+
+    The client is opened in the app lifespan and reused by every proxied
+    request, so connections (and DNS lookups) are paid once per pool slot
+    instead of once per request. It is also created lazily on first use,
+    so code paths that run without the lifespan (tests, scripts) still work.
+
+    `uds` routes all requests over a Unix domain socket (the host in
+    `base_url` is then only used for the Host header). `http2` requires the
+    optional `h2` package (`pip install httpx[http2]`). httpx itself is
+    only imported when the client is created, which keeps it out of the
+    app's import time.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        connect_timeout: float = 2.0,
+        http2: bool = False,
+        uds: str | None = None,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ):
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.http2 = http2
+        self.uds = uds or None
+        self._transport = transport
+        self._client: "httpx.AsyncClient | None" = None
+        self._requests = 0
+        self._connections_opened = 0
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        transport = self._transport or httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            uds=self.uds,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def warm_up(self, connections: int) -> None:
+        """
+        Open up to `connections` keep-alive connections with concurrent liveness checks.
+
+        Best effort: at start-up the upstream may not be reachable yet.
+        """
+        await self.start()
+        results = await asyncio.gather(
+            *(self.client.get("/health/live") for _ in range(connections)),
+            return_exceptions=True,
+        )
+        failed = sum(isinstance(result, Exception) for result in results)
+        if failed:
+            logger.warning("%d of %d upstream warm-up requests failed", failed, connections)
+
+    async def close(self) -> None:
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+
+    async def stream(self, method: str, url: str, **kwargs) -> StreamingResponse:
+        """
+        Proxy a request and relay the upstream body chunk by chunk.
+
+        The body is never buffered: each chunk is read from upstream only
+        after the previous one was sent to the client, so a slow client
+        slows down the upstream read instead of growing memory. Status code
+        and `PASSTHROUGH_HEADERS` are forwarded unchanged.
+        """
+        request = self.client.build_request(method, url, **kwargs)
+        response = await self.client.send(request, stream=True)
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={
+                name: response.headers[name]
+                for name in PASSTHROUGH_HEADERS
+                if name in response.headers
+            },
+            background=BackgroundTask(response.aclose),
+        )
+
+    async def _on_request(self, request: "httpx.Request") -> None:
+        self._requests += 1
+        request.extensions["trace"] = self._trace
+        request.extensions["started"] = time.perf_counter()
+
+    async def _on_response(self, response: "httpx.Response") -> None:
+        # Time to the upstream response headers; streamed bodies are relayed afterwards
+        STAGE_SECONDS.labels("pdf_service_proxy").observe(
+            time.perf_counter() - response.request.extensions["started"]
+        )
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name in _NEW_CONNECTION_EVENTS:
+            self._connections_opened += 1
+
+    def stats(self) -> dict:
+        """
+        Connection reuse counters.
+
+        Every request either opens a new connection or reuses a kept-alive
+        one, so `reused_requests` is the difference of the two counters.
+        """
+        return {
+            "base_url": self.base_url,
+            "uds": self.uds,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "requests": self._requests,
+            "connections_opened": self._connections_opened,
+            "reused_requests": max(0, self._requests - self._connections_opened),
+        }
+
+
+pdf_service_client = UpstreamClient(
+    settings.PDF_SERVICE_URL,
+    max_connections=settings.PDF_SERVICE_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.PDF_SERVICE_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.PDF_SERVICE_KEEPALIVE_EXPIRY,
+    timeout=settings.PDF_SERVICE_TIMEOUT,
+    connect_timeout=settings.PDF_SERVICE_CONNECT_TIMEOUT,
+    http2=settings.PDF_SERVICE_HTTP2,
+    uds=settings.PDF_SERVICE_UDS,
+)
@@ -1,12 +1,75 @@
-import httpx
-from fastapi import FastAPI, Depends, Response
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Header, Request, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from common.health import health, install_drain_handler, router as health_router
+from common.jwt_cache import jose_jwt
+from common.metrics import CONTENT_TYPE, MetricsMiddleware, metrics_text
+from common.profiling import ProfilingMiddleware
+from user_service.src.core.config import settings
+from user_service.src.core.database import replicas, warm_up_pool
+from user_service.src.core.upstream import pdf_service_client
+from user_service.src.security.hashing_pool import HashingPoolSaturated, hashing_pool
+from user_service.src.security.password import load_backend
+from user_service.src.stats.routers import router as stats_router
+from user_service.src.user.cache import user_cache
+from user_service.src.user.pdf_export import pdf_export_pool
 from user_service.src.user.routers import router as auth_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Libraries kept out of the import path are loaded before the first request
+    await asyncio.gather(asyncio.to_thread(jose_jwt), asyncio.to_thread(load_backend))
+    await hashing_pool.start()
+    await pdf_export_pool.start()
+    await pdf_service_client.start()
+    # Connections are opened now rather than by the first requests after a deploy
+    await asyncio.gather(
+        warm_up_pool(),
+        replicas.start(),
+        pdf_service_client.warm_up(settings.PDF_SERVICE_WARM_CONNECTIONS),
+    )
+    install_drain_handler()
+    health.mark_ready()
+    yield
+    health.start_draining()
+    await replicas.close()
+    await pdf_service_client.close()
+    await user_cache.close()
+    pdf_export_pool.shutdown()
+    hashing_pool.shutdown()
+
+
 app = FastAPI(
     title="User Service API",
+    lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware, name="user_service")
+if settings.PROFILE_DIR:
+    app.add_middleware(
+        ProfilingMiddleware,
+        name="user_service",
+        directory=settings.PROFILE_DIR,
+        api_key=settings.PROFILE_API_KEY,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        interval_ms=settings.PROFILE_INTERVAL_MS,
+        output_format=settings.PROFILE_FORMAT,
+    )
+app.include_router(health_router)
 app.include_router(auth_router, prefix="/api/v1")
+app.include_router(stats_router, prefix="/api/v1")
+
+
+@app.exception_handler(HashingPoolSaturated)
+async def hashing_pool_saturated(request: Request, exc: HashingPoolSaturated):
+    # Register and login shed load instead of queueing without bound
+    return JSONResponse(
+        {"detail": "Server is busy, try again later"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
 
 
 security = HTTPBearer()
@@ -18,21 +81,16 @@ security = HTTPBearer()
     summary="Download profile PDF",
     description="Generates and downloads a PDF with the current user's profile data.",
     response_class=Response,
-    responses={200: {"content": {"application/pdf": {}}}},
+    responses={200: {"content": {"application/pdf": {}}}, 304: {"description": "Not Modified"}},
 )
 async def pdf_profile(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    if_none_match: str | None = Header(default=None),
 ):
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "http://pdf_service:8001/api/v1/pdf/profile",
-            headers={"Authorization": f"Bearer {credentials.credentials}"},
-        )
-    return Response(
-        content=response.content,
-        media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=profile.pdf"},
-    )
+    headers = {"Authorization": f"Bearer {credentials.credentials}"}
+    if if_none_match:
+        headers["If-None-Match"] = if_none_match
+    return await pdf_service_client.stream("GET", "/api/v1/pdf/profile", headers=headers)
 
 
 @app.post(
@@ -44,14 +102,18 @@ async def pdf_profile(
 async def pdf_save(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "http://pdf_service:8001/api/v1/pdf/save",
-            headers={"Authorization": f"Bearer {credentials.credentials}"},
-        )
+    response = await pdf_service_client.client.post(
+        "/api/v1/pdf/save",
+        headers={"Authorization": f"Bearer {credentials.credentials}"},
+    )
     return response.json()
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(metrics_text(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 def read_root():
     return {"status": "Backend is running"}
@@ -0,0 +1,25 @@
+"""
+Benchmark bcrypt on this host and print the cost that fits the latency budget.
+
+Usage:
+    python -m user_service.src.security.calibrate --target-ms 250
+"""
+import argparse
+
+from user_service.src.core.config import settings
+from user_service.src.security.password import calibrate_rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target-ms", type=int, default=settings.PASSWORD_HASH_TARGET_MS)
+    parser.add_argument("--min-rounds", type=int, default=settings.PASSWORD_HASH_MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    args = parser.parse_args()
+
+    rounds = calibrate_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from user_service.src.core.config import settings
+from user_service.src.security.password import (
+    configure_rounds,
+    current_rounds,
+    hash_password,
+    load_backend,
+    verify_password,
+)
+
+# Hashes per job submitted by `hash_many`: small enough that interactive
+# calls get a worker within a few hashes' time during a bulk import.
+HASH_MANY_CHUNK_SIZE = 4
+
+
+class HashingPoolSaturated(Exception):
+    """Too many hashing calls are already waiting; the caller should retry later."""
+
+
+def _warm_up() -> None:
+    """Runs once per worker so the first real hash doesn't pay for process start-up."""
+    load_backend()
+
+
+def _hash_many(passwords: list[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
+class PasswordHashingPool:
+    """
+    Runs bcrypt hashing/verification in a bounded process pool.
+
+    bcrypt is CPU-bound, so calling it inside an `async def` handler blocks the
+    whole event loop. This pool moves the work to separate processes and lets
+    the handler `await` the result.
+
+    If the pool has not been started (e.g. in tests, where the app lifespan
+    does not run), calls fall back to the default thread executor so they
+    still don't run on the event loop.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._calls = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+        self._last_seconds = 0.0
+
+    async def start(self) -> None:
+        """
+        Create the worker processes and wait until every one of them is up.
+
+        Workers use the bcrypt cost that is current at start time, so call
+        `configure_rounds` before starting the pool.
+        """
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=configure_rounds,
+            initargs=(current_rounds(),),
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.max_workers))
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash a batch of passwords in small chunks, at most one per worker at a time.
+
+        The executor runs jobs in submission order, so a login or register
+        call arriving during a bulk import only waits behind the chunks
+        already submitted (`max_workers` of `HASH_MANY_CHUNK_SIZE` hashes),
+        not behind the whole batch. The batch occupies at most
+        `max_workers` pending slots.
+        """
+        if not passwords:
+            return []
+        size = HASH_MANY_CHUNK_SIZE
+        chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+        results: list[list[str]] = [[] for _ in chunks]
+        indexes = iter(range(len(chunks)))
+
+        async def submit_next() -> None:
+            for index in indexes:
+                results[index] = await self._run(_hash_many, chunks[index])
+
+        await asyncio.gather(*(submit_next() for _ in range(min(self.max_workers, len(chunks)))))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise HashingPoolSaturated(f"{self._pending} hashing calls pending")
+
+        executor: Executor | None = self._executor
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._pending -= 1
+            self._calls += 1
+            self._total_seconds += elapsed
+            self._last_seconds = elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the pool state.
+
+        `queue_depth` is the number of calls waiting for a free worker;
+        latencies include the time spent waiting in that queue.
+        """
+        return {
+            "running": self._executor is not None,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._pending,
+            "queue_depth": max(0, self._pending - self.max_workers),
+            "calls": self._calls,
+            "avg_latency_ms": (self._total_seconds / self._calls * 1000) if self._calls else 0.0,
+            "max_latency_ms": self._max_seconds * 1000,
+            "last_latency_ms": self._last_seconds * 1000,
+        }
+
+
+hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
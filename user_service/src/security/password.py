@@ -1,11 +1,35 @@
-from passlib.context import CryptContext
+import time
+from functools import cache
 
+from user_service.src.core.config import settings
+
+
+@cache
+def _context():
+    """
+    The process-wide passlib context, created on first use.
+
+    passlib is imported here rather than at module level so importing the
+    app stays fast; the lifespan touches it (`current_rounds`) before the
+    hashing pool starts, so requests never pay for the import.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        # Pinned exactly, so stored hashes converge on the policy cost
+        # whether it was raised or lowered
+        bcrypt__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+        bcrypt__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+        bcrypt__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+        deprecated="auto"
+    )
+
+
+def load_backend() -> None:
+    """Import passlib and bcrypt now instead of on the first hash."""
+    _context().handler("bcrypt").get_backend()
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    bcrypt__rounds=14,
-    deprecated="auto"
-)
 
 def hash_password(password:str) -> str:
     """
@@ -13,7 +37,7 @@ def hash_password(password:str) -> str:
     This function takes a plain-text password and returns its bcrypt hash.
     The bcrypt algorithm is used with a specified number of rounds for enhanced security.
     """
-    return pwd_context.hash(password)
+    return _context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -23,4 +47,58 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     This function compares a plain-text password with a hashed password and returns True
     if they match, and False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _context().verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was produced with a different cost than the current policy.
+
+    Hashes passlib can't identify are reported as up to date — they can't be
+    verified either, so there is nothing to migrate.
+    """
+    try:
+        return _context().needs_update(hashed_password)
+    except ValueError:
+        return False
+
+
+def configure_rounds(rounds: int) -> None:
+    """
+    Switch the bcrypt cost for new hashes.
+
+    Hashes with any other cost are reported by `needs_rehash`, so they get
+    rehashed the next time their owner logs in. Every process must use the
+    same cost, otherwise they keep rehashing each other's hashes; calibrate
+    once with `python -m user_service.src.security.calibrate` and set
+    `PASSWORD_HASH_ROUNDS`.
+    """
+    _context().update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def current_rounds() -> int:
+    return _context().to_dict()["bcrypt__default_rounds"]
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+    """
+    Pick the highest bcrypt cost whose hash time fits into `target_ms` on this host.
+
+    Each extra round doubles the work, so costs are measured from `min_rounds`
+    upwards and the search stops at the first one over budget. `min_rounds`
+    is returned even if it's already too slow.
+    """
+    handler = _context().handler("bcrypt")
+    best = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        handler.using(rounds=rounds).hash("calibration-password")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > target_ms:
+            break
+        best = rounds
+    return best
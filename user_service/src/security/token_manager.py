@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from user_service.src.core.config import settings
-from jose import jwt, JWTError
+
+from common.jwt_cache import VerifiedTokenCache, jose_jwt
+
+token_cache = VerifiedTokenCache(max_entries=settings.JWT_CACHE_MAX_ENTRIES)
 
 
 def create_access_token(
@@ -32,7 +35,7 @@ def create_access_token(
         "type": "access",
     }
 
-    return jwt.encode(
+    return jose_jwt().encode(
         to_encode, settings.SECRET_KEY_ACCESS, algorithm=settings.JWT_SIGNING_ALGORITHM
     )
 
@@ -40,9 +43,13 @@ def create_access_token(
 def decode_access_token(token: str) -> dict | None:
     """
     Decode and validate an access token, returning the token's data.
+
+    Verified payloads are cached until the token expires, see `VerifiedTokenCache`.
     """
+    from jose import JWTError
+
     try:
-        payload = jwt.decode(
+        payload = token_cache.decode(
             token,
             settings.SECRET_KEY_ACCESS,
             algorithms=[settings.JWT_SIGNING_ALGORITHM],
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends
+
+from user_service.src.core.dependencies import require_admin
+from user_service.src.core.database import engine, replicas
+from user_service.src.core.db_pool import pool_status
+from user_service.src.core.upstream import pdf_service_client
+from user_service.src.security.hashing_pool import hashing_pool
+from user_service.src.security.token_manager import token_cache
+from user_service.src.user.cache import user_cache
+from user_service.src.user.pdf_export import pdf_export_pool
+
+# Pool sizes, internal hosts and socket paths are not for the public
+router = APIRouter(prefix="/stats", tags=["Stats"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/password-hashing", summary="Password hashing pool stats")
+async def password_hashing_stats():
+    return hashing_pool.stats()
+
+
+@router.get("/db-pool", summary="Database connection pool stats")
+async def db_pool_stats():
+    return pool_status(engine)
+
+
+@router.get("/db-replicas", summary="Read replica health, routed reads and pool stats")
+async def db_replicas_stats():
+    stats = replicas.stats()
+    for entry, replica in zip(stats["replicas"], replicas.engines):
+        entry["pool"] = pool_status(replica)
+    return stats
+
+
+@router.get("/upstream", summary="pdf_service client connection reuse stats")
+async def upstream_stats():
+    return pdf_service_client.stats()
+
+
+@router.get("/pdf-export", summary="Bulk PDF export render pool stats")
+async def pdf_export_stats():
+    return pdf_export_pool.stats()
+
+
+@router.get("/token-cache", summary="Verified JWT cache hit/miss counters")
+async def token_cache_stats():
+    return token_cache.stats()
+
+
+@router.get("/user-cache", summary="User lookup cache hits, misses and invalidations")
+async def user_cache_stats():
+    return user_cache.stats()
@@ -1,10 +1,14 @@
+from unittest.mock import patch
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
-from user_service.src.core.database import Base, get_async_session
+from user_service.src.core.config import settings
+from user_service.src.core.database import Base, get_async_session, get_read_session
 from user_service.src.main import app
+from user_service.src.user.cache import user_cache
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -21,6 +25,7 @@ async def override_get_async_session():
 
 
 app.dependency_overrides[get_async_session] = override_get_async_session
+app.dependency_overrides[get_read_session] = override_get_async_session
 
 
 @pytest_asyncio.fixture(autouse=True)
@@ -30,6 +35,8 @@ async def setup_database():
     yield
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # The database is recreated per test, so cached users must not outlive it
+    user_cache.clear()
 
 
 @pytest_asyncio.fixture
@@ -38,6 +45,33 @@ async def db_session():
         yield session
 
 
+@pytest.fixture
+def valid_user() -> dict:
+    return {
+        "name": "John",
+        "surname": "Doe",
+        "email": "john@example.com",
+        "date_of_birthday": "1990-01-15",
+        "password": "Secure123!",
+    }
+
+
+@pytest.fixture
+def mock_password_hashing():
+    """Replace bcrypt with a cheap reversible stand-in; opt in with `usefixtures`."""
+    with patch("user_service.src.security.hashing_pool.hash_password") as mock_hash:
+        mock_hash.side_effect = lambda p: f"hashed_{p}"
+        with patch("user_service.src.security.hashing_pool.verify_password") as mock_verify:
+            mock_verify.side_effect = lambda p, h: h == f"hashed_{p}"
+            yield
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    return {"X-Admin-Key": "test-admin-key"}
+
+
 @pytest_asyncio.fixture
 async def client():
     async with AsyncClient(
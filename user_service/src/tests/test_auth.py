@@ -1,14 +1,18 @@
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
 from unittest.mock import patch
 
+from user_service.src.user.crud import create_user
+from user_service.src.user.schemas import UserRegisterSchema
+
 
 @pytest.fixture(autouse=True)
 def mock_password_hashing():
 
-    with patch("user_service.src.security.password.pwd_context.hash") as mock_hash:
+    with patch("user_service.src.security.hashing_pool.hash_password") as mock_hash:
         mock_hash.side_effect = lambda p: f"hashed_{p}"
-        with patch("user_service.src.security.password.pwd_context.verify") as mock_verify:
+        with patch("user_service.src.security.hashing_pool.verify_password") as mock_verify:
             mock_verify.side_effect = lambda p, h: h == f"hashed_{p}"
             yield
 
@@ -83,3 +87,15 @@ async def test_login_nonexistent_user(client: AsyncClient):
     )
 
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_create_user_returns_generated_columns(db_session):
+    user = await create_user(db_session, UserRegisterSchema(**VALID_USER))
+
+    assert user.id is not None
+    assert user.created_at is not None
+
+    with pytest.raises(HTTPException) as exc_info:
+        await create_user(db_session, UserRegisterSchema(**VALID_USER))
+    assert exc_info.value.status_code == 400
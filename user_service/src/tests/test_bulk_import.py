@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from user_service.src.core.config import settings
+
+pytestmark = pytest.mark.usefixtures("mock_password_hashing", "admin_headers")
+
+
+@pytest.fixture
+def make_user(valid_user):
+    return lambda email: {**valid_user, "email": email}
+
+
+def to_ndjson(*rows) -> str:
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows) + "\n"
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_reports_every_row(client: AsyncClient, make_user, admin_headers: dict):
+    await client.post("/api/v1/user/register/", json=make_user("existing@example.com"))
+
+    body = to_ndjson(
+        make_user("a@example.com"),
+        make_user("existing@example.com"),
+        "{not json",
+        "",
+        make_user("b@example.com"),
+        make_user("a@example.com"),
+    )
+    response = await client.post(
+        "/api/v1/user/import/",
+        content=body,
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["line"], r["status"]) for r in report] == [
+        (3, "invalid"),
+        (1, "created"),
+        (2, "duplicate"),
+        (5, "created"),
+        (6, "duplicate"),
+    ]
+
+    login = await client.post(
+        "/api/v1/user/login/",
+        json={"email": "b@example.com", "password": "Secure123!"},
+    )
+    assert login.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_batches(
+    client: AsyncClient, monkeypatch, make_user, admin_headers: dict
+):
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+    body = to_ndjson(*(make_user(f"user{i}@example.com") for i in range(5)))
+
+    response = await client.post(
+        "/api/v1/user/import/", content=body, headers=admin_headers
+    )
+
+    statuses = [json.loads(line)["status"] for line in response.text.splitlines()]
+    assert statuses == ["created"] * 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_requires_admin_key(client: AsyncClient, make_user):
+    response = await client.post(
+        "/api/v1/user/import/",
+        content=to_ndjson(make_user("a@example.com")),
+        headers={"X-Admin-Key": "wrong"},
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,49 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from user_service.src.core.db_pool import (
+    InstrumentedAsyncQueuePool,
+    instrument_connects,
+    pool_status,
+)
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkouts_connects_and_overflow(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    instrument_connects(engine)
+
+    async with engine.connect() as first, engine.connect() as second:
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+        busy = pool_status(engine)
+    await engine.dispose()
+
+    assert busy["checked_out"] == 2
+    assert busy["overflow"] == 1
+    assert busy["checkouts"] == 2
+    assert busy["overflow_checkouts"] == 1
+    assert busy["connects"] == 2
+    assert pool_status(engine)["checkouts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_db_pool_stats_endpoint(client: AsyncClient, admin_headers: dict):
+    response = await client.get("/api/v1/stats/db-pool", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert {"pool_size", "checked_out", "avg_wait_ms", "avg_connect_ms"} <= response.json().keys()
+
+
+@pytest.mark.asyncio
+async def test_stats_require_the_admin_key(client: AsyncClient, admin_headers: dict):
+    assert (await client.get("/api/v1/stats/db-pool")).status_code == 403
+    response = await client.get("/api/v1/stats/upstream", headers={"X-Admin-Key": "wrong"})
+    assert response.status_code == 403
@@ -0,0 +1,137 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from user_service.src.core.database import Base, ReplicaSet, get_read_session, is_replica
+from user_service.src.main import app
+from user_service.src.user import crud
+from user_service.src.user.cache import NOT_CACHED, user_cache
+from user_service.src.user.crud import find_user_by_email
+from user_service.src.user.models import UserModel
+
+pytestmark = pytest.mark.usefixtures("mock_password_hashing")
+
+
+@pytest_asyncio.fixture
+async def replica(tmp_path):
+    """A second, empty database standing in for a replica that hasn't caught up."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def broken_replica(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    yield engine
+    await engine.dispose()
+
+
+def replica_session(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)(info={"replica": True})
+
+
+async def add_user(session, user: dict) -> None:
+    session.add(UserModel(
+        email=user["email"],
+        name=user["name"],
+        surname=user["surname"],
+        date_of_birthday=date.fromisoformat(user["date_of_birthday"]),
+        hashed_password=f"hashed_{user['password']}",
+        is_active=True,
+    ))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_over_healthy_replicas(replica, broken_replica, tmp_path):
+    other = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'other.db'}")
+    replicas = ReplicaSet([replica, broken_replica, other], check_interval=60, check_timeout=5)
+
+    await replicas.check()
+    chosen = [replicas.choose() for _ in range(4)]
+    await other.dispose()
+
+    assert replicas.healthy == [True, False, True]
+    assert chosen == [replica, other, replica, other]
+    assert replicas.stats()["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_the_primary_without_healthy_replicas(broken_replica):
+    replicas = ReplicaSet([broken_replica], check_interval=60, check_timeout=5)
+
+    await replicas.check()
+
+    assert replicas.choose() is None
+    assert replicas.stats()["primary_reads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replica_miss_falls_back_to_the_primary(db_session, replica, valid_user: dict):
+    await add_user(db_session, valid_user)
+
+    async with replica_session(replica) as read_session:
+        assert is_replica(read_session)
+        user = await find_user_by_email(read_session, db_session, valid_user["email"])
+
+    assert user.email == valid_user["email"]
+
+
+@pytest.mark.asyncio
+async def test_replica_miss_is_not_cached(replica, valid_user: dict):
+    async with replica_session(replica) as read_session:
+        assert await crud.get_user_by_email(read_session, valid_user["email"]) is None
+
+    assert await user_cache.get(f"user:email:{valid_user['email']}") is NOT_CACHED
+
+
+@pytest.mark.asyncio
+async def test_failing_replica_is_marked_down(
+    db_session, broken_replica, monkeypatch, valid_user: dict
+):
+    replicas = ReplicaSet([broken_replica], check_interval=60, check_timeout=5)
+    monkeypatch.setattr(crud, "replicas", replicas)
+    await add_user(db_session, valid_user)
+
+    async with replica_session(broken_replica) as read_session:
+        user = await find_user_by_email(read_session, db_session, valid_user["email"])
+
+    assert user.email == valid_user["email"]
+    assert replicas.healthy == [False]
+
+
+@pytest.mark.asyncio
+async def test_login_right_after_registration_with_a_lagging_replica(
+    client: AsyncClient, replica, valid_user: dict
+):
+    async def lagging_read_session():
+        async with replica_session(replica) as session:
+            yield session
+
+    previous = app.dependency_overrides[get_read_session]
+    app.dependency_overrides[get_read_session] = lagging_read_session
+    try:
+        await client.post("/api/v1/user/register/", json=valid_user)
+        response = await client.post(
+            "/api/v1/user/login/",
+            json={"email": valid_user["email"], "password": valid_user["password"]},
+        )
+    finally:
+        app.dependency_overrides[get_read_session] = previous
+
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_db_replicas_stats_endpoint(client: AsyncClient, admin_headers: dict):
+    response = await client.get("/api/v1/stats/db-replicas", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"replicas": [], "primary_reads": 0, "failures": 0}
@@ -0,0 +1,72 @@
+import asyncio
+
+import bcrypt
+import pytest
+from httpx import AsyncClient
+
+from user_service.src.security.hashing_pool import (
+    HashingPoolSaturated,
+    PasswordHashingPool,
+    hashing_pool,
+)
+from user_service.src.security.password import configure_rounds, current_rounds
+
+
+@pytest.mark.asyncio
+async def test_verify_runs_in_process_pool():
+    pool = PasswordHashingPool(max_workers=1, max_pending=4)
+    hashed = bcrypt.hashpw(b"Secure123!", bcrypt.gensalt(4)).decode()
+
+    await pool.start()
+    try:
+        assert await pool.verify("Secure123!", hashed) is True
+        assert await pool.verify("WrongPassword", hashed) is False
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["calls"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_verify_is_not_queued_behind_a_bulk_import():
+    original = current_rounds()
+    configure_rounds(8)
+    pool = PasswordHashingPool(max_workers=1, max_pending=4)
+    hashed = bcrypt.hashpw(b"Secure123!", bcrypt.gensalt(4)).decode()
+
+    await pool.start()
+    try:
+        bulk = asyncio.create_task(pool.hash_many([f"password-{i}" for i in range(100)]))
+        await asyncio.sleep(0.05)
+        verify = asyncio.create_task(pool.verify("Secure123!", hashed))
+        done, _ = await asyncio.wait({bulk, verify}, return_when=asyncio.FIRST_COMPLETED)
+
+        assert done == {verify}
+        assert verify.result() is True
+        assert len(await bulk) == 100
+    finally:
+        pool.shutdown()
+        configure_rounds(original)
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_sheds_load(client: AsyncClient, monkeypatch, valid_user: dict):
+    monkeypatch.setattr(hashing_pool, "max_pending", 0)
+
+    with pytest.raises(HashingPoolSaturated):
+        await hashing_pool.hash("Secure123!")
+    response = await client.post("/api/v1/user/register/", json=valid_user)
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Server is busy, try again later"}
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_stats_endpoint(client: AsyncClient, admin_headers: dict):
+    response = await client.get("/api/v1/stats/password-hashing", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert {"queue_depth", "in_flight", "avg_latency_ms"} <= response.json().keys()
@@ -0,0 +1,48 @@
+import os
+import signal
+import threading
+
+import pytest
+from httpx import AsyncClient
+
+from common.health import health, install_drain_handler
+
+
+@pytest.fixture(autouse=True)
+def reset_health():
+    yield
+    health.ready = False
+    health.draining = False
+
+
+@pytest.mark.asyncio
+async def test_readiness_follows_the_lifespan(client: AsyncClient):
+    assert (await client.get("/health/live")).status_code == 200
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+
+    health.mark_ready()
+    assert (await client.get("/health/ready")).status_code == 200
+
+    health.start_draining()
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "draining"}
+    assert (await client.get("/health/live")).status_code == 200
+
+
+def test_sigterm_fails_readiness_before_reaching_the_server():
+    stopped = threading.Event()
+    previous = signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    try:
+        health.mark_ready()
+        install_drain_handler(delay=0.2)
+
+        os.kill(os.getpid(), signal.SIGTERM)
+
+        assert health.status == "draining"
+        assert not stopped.is_set()
+        assert stopped.wait(2)
+    finally:
+        signal.signal(signal.SIGTERM, previous)
@@ -0,0 +1,52 @@
+import pytest
+from httpx import AsyncClient
+
+from common.metrics import Registry, merge, render
+
+
+def test_render_histogram_is_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("stage_seconds", "Stages", "stage", buckets=(0.1, 1.0))
+    histogram.labels("db").observe(0.05)
+    histogram.labels("db").observe(0.5)
+    histogram.labels("db").observe(5)
+
+    text = render(registry.snapshot())
+
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="db",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="db",le="1.0"} 2' in text
+    assert 'stage_seconds_bucket{stage="db",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="db"} 3' in text
+
+
+def test_merge_sums_processes():
+    first, second = Registry(), Registry()
+    for registry, pid in ((first, "1"), (second, "2")):
+        registry.histogram("stage_seconds", "Stages", "stage", buckets=(1.0,)).labels("s3").observe(0.5)
+        registry.gauge("lag_seconds", "Lag", "pid").labels(pid).set(3)
+
+    merged = merge([first.snapshot(), second.snapshot()])
+
+    assert merged["stage_seconds"]["series"]["s3"]["counts"] == [2, 0]
+    assert merged["lag_seconds"]["series"] == {"1": 3, "2": 3}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_password_hashing")
+async def test_metrics_endpoint_reports_login_stages(client: AsyncClient, valid_user: dict):
+    register = await client.post("/api/v1/user/register/", json=valid_user)
+    login = await client.post(
+        "/api/v1/user/login/",
+        json={"email": valid_user["email"], "password": valid_user["password"]},
+    )
+    assert register.status_code == 201
+    assert login.status_code == 200
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for stage in ("crud.get_user_by_email", "verify_password", "create_access_token"):
+        assert f'stage_duration_seconds_count{{stage="{stage}"}}' in response.text
+    assert 'http_request_duration_seconds_count{route="/api/v1/user/login/"}' in response.text
@@ -0,0 +1,59 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from user_service.src.security.password import (
+    calibrate_rounds,
+    configure_rounds,
+    current_rounds,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+from user_service.src.user.crud import get_user_by_email
+
+
+@pytest.fixture(autouse=True)
+def cheap_rounds():
+    original = current_rounds()
+    configure_rounds(4)
+    yield
+    configure_rounds(original)
+
+
+def test_calibrate_rounds_respects_budget():
+    assert calibrate_rounds(target_ms=0, min_rounds=4, max_rounds=6) == 4
+    assert calibrate_rounds(target_ms=60_000, min_rounds=4, max_rounds=6) == 6
+
+
+def test_needs_rehash_after_policy_change():
+    hashed = hash_password("Secure123!")
+    assert needs_rehash(hashed) is False
+
+    configure_rounds(5)
+    assert needs_rehash(hashed) is True
+    assert needs_rehash("not-a-known-hash") is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stored, policy", [(4, 5), (5, 4)], ids=["raised", "lowered"])
+async def test_login_rehashes_password_to_the_policy_cost(
+    client: AsyncClient, db_session, monkeypatch, valid_user: dict, stored: int, policy: int
+):
+    monkeypatch.setattr(
+        "user_service.src.user.routers.async_session_maker",
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+    )
+    configure_rounds(stored)
+    await client.post("/api/v1/user/register/", json=valid_user)
+
+    configure_rounds(policy)
+    response = await client.post(
+        "/api/v1/user/login/",
+        json={"email": valid_user["email"], "password": valid_user["password"]},
+    )
+
+    assert response.status_code == 200
+    user = await get_user_by_email(db_session, valid_user["email"])
+    assert user.hashed_password.startswith(f"$2b$0{policy}$")
+    assert verify_password(valid_user["password"], user.hashed_password)
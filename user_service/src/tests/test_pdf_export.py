@@ -0,0 +1,118 @@
+import io
+import zipfile
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pdf_service.src.pdf.service import generate_user_pdf
+from user_service.src.core.config import settings
+from user_service.src.user import pdf_export
+from user_service.src.user.models import UserModel
+
+ADMIN_KEY = "test-admin-key"
+
+
+@pytest.fixture(autouse=True)
+def admin_key(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", ADMIN_KEY)
+
+
+async def add_users(session: AsyncSession, count: int) -> None:
+    session.add_all(
+        UserModel(
+            name=f"User{i}",
+            surname="Doe",
+            email=f"user{i}@example.com",
+            date_of_birthday=date(1990, 1, 15),
+            hashed_password="hashed",
+            is_active=i % 2 == 0,
+        )
+        for i in range(1, count + 1)
+    )
+    await session.commit()
+
+
+async def export(client: AsyncClient, **params) -> zipfile.ZipFile:
+    response = await client.get(
+        "/api/v1/user/export/pdf/", params=params, headers={"X-Admin-Key": ADMIN_KEY}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+@pytest.mark.asyncio
+async def test_export_streams_a_pdf_per_user(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    # Several batches, so entries from different cursor batches end up in one archive
+    monkeypatch.setattr(settings, "PDF_EXPORT_BATCH_SIZE", 3)
+    await add_users(db_session, 7)
+
+    archive = await export(client)
+
+    assert archive.testzip() is None
+    assert archive.namelist() == [f"profiles/{i}.pdf" for i in range(1, 8)]
+    assert archive.read("profiles/2.pdf") == generate_user_pdf(
+        name="User2", surname="Doe", email="user2@example.com", date_of_birthday="1990-01-15"
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_filters_by_id_range_and_status(client: AsyncClient, db_session: AsyncSession):
+    await add_users(db_session, 10)
+
+    archive = await export(client, start_id=3, end_id=8, is_active=True)
+
+    assert archive.namelist() == ["profiles/4.pdf", "profiles/6.pdf", "profiles/8.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_export_of_no_users_is_an_empty_archive(client: AsyncClient):
+    archive = await export(client)
+
+    assert archive.namelist() == []
+
+
+@pytest.mark.asyncio
+async def test_export_requires_admin_key(client: AsyncClient):
+    response = await client.get("/api/v1/user/export/pdf/")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_export_renders_names_that_look_like_markup(
+    client: AsyncClient, db_session: AsyncSession
+):
+    await add_users(db_session, 3)
+    user = await db_session.get(UserModel, 2)
+    user.name = "O<Brien"
+    user.surname = "<b>x"
+    await db_session.commit()
+
+    archive = await export(client, start_id=1, end_id=3)
+
+    assert archive.namelist() == ["profiles/1.pdf", "profiles/2.pdf", "profiles/3.pdf"]
+    assert archive.read("profiles/2.pdf").startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_export_skips_profiles_that_fail_to_render(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    def generate(name, **fields):
+        if name == "User2":
+            raise ValueError("cannot render")
+        return generate_user_pdf(name=name, **fields)
+
+    monkeypatch.setattr(pdf_export, "generate_user_pdf", generate)
+    await add_users(db_session, 3)
+
+    archive = await export(client)
+
+    assert archive.testzip() is None
+    assert archive.namelist() == ["profiles/1.pdf", "profiles/3.pdf", "errors.txt"]
+    assert archive.read("errors.txt") == b"profiles/2.pdf: ValueError: cannot render\n"
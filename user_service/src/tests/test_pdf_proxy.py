@@ -0,0 +1,92 @@
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from user_service.src.core.upstream import UpstreamClient
+
+PDF_BYTES = b"%PDF-1.4 fake"
+
+
+def streamed(status_code: int, body: bytes, headers: dict) -> httpx.Response:
+    # Like a real transport: the body is not read until someone iterates it.
+    return httpx.Response(
+        status_code,
+        stream=httpx.ByteStream(body),
+        headers={"Content-Length": str(len(body)), **headers},
+    )
+
+
+def pdf_service_handler(request: httpx.Request) -> httpx.Response:
+    if request.headers["Authorization"] != "Bearer token":
+        return streamed(401, b'{"detail":"Invalid token"}', {"Content-Type": "application/json"})
+    if request.url.path == "/api/v1/pdf/profile":
+        if request.headers.get("If-None-Match") == '"abc"':
+            return streamed(304, b"", {"ETag": '"abc"'})
+        return streamed(
+            200,
+            PDF_BYTES,
+            {
+                "Content-Type": "application/pdf",
+                "Content-Disposition": "attachment; filename=profile.pdf",
+                "ETag": '"abc"',
+            },
+        )
+    return httpx.Response(200, json={"detail": "PDF queued for saving to S3", "s3_url": "url"})
+
+
+@pytest_asyncio.fixture
+async def upstream(monkeypatch):
+    upstream = UpstreamClient(
+        "http://pdf_service:8001", transport=httpx.MockTransport(pdf_service_handler)
+    )
+    monkeypatch.setattr("user_service.src.main.pdf_service_client", upstream)
+    yield upstream
+    await upstream.close()
+
+
+@pytest.mark.asyncio
+async def test_pdf_profile_is_proxied(client: AsyncClient, upstream: UpstreamClient):
+    response = await client.get(
+        "/api/v1/pdf/profile", headers={"Authorization": "Bearer token"}
+    )
+
+    assert response.status_code == 200
+    assert response.content == PDF_BYTES
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-length"] == str(len(PDF_BYTES))
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["content-disposition"] == "attachment; filename=profile.pdf"
+
+
+@pytest.mark.asyncio
+async def test_pdf_profile_forwards_conditional_get(client: AsyncClient, upstream: UpstreamClient):
+    response = await client.get(
+        "/api/v1/pdf/profile",
+        headers={"Authorization": "Bearer token", "If-None-Match": '"abc"'},
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_pdf_profile_passes_upstream_errors_through(
+    client: AsyncClient, upstream: UpstreamClient
+):
+    response = await client.get(
+        "/api/v1/pdf/profile", headers={"Authorization": "Bearer expired"}
+    )
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid token"}
+
+
+@pytest.mark.asyncio
+async def test_upstream_client_is_reused(client: AsyncClient, upstream: UpstreamClient):
+    for _ in range(3):
+        await client.post("/api/v1/pdf/save", headers={"Authorization": "Bearer token"})
+
+    assert upstream.stats()["requests"] == 3
+    assert upstream.client is upstream.client
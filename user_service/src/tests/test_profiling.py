@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from common.profiling import ProfilingMiddleware, StackSampler, collapsed, speedscope
+from user_service.src.main import app
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_records_the_calling_thread():
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    busy_wait(0.05)
+    samples = sampler.stop()
+
+    folded = collapsed(samples)
+    assert "MainThread;" in folded
+    assert "test_profiling:busy_wait:" in folded
+    profile = speedscope(samples, 0.001, "busy")
+    assert profile["profiles"][0]["type"] == "sampled"
+    assert len(profile["profiles"][0]["samples"]) == len(profile["profiles"][0]["weights"])
+
+
+def profiled_client(tmp_path, **kwargs) -> AsyncClient:
+    middleware = ProfilingMiddleware(
+        app, name="user_service", directory=str(tmp_path), api_key="secret", interval_ms=1, **kwargs
+    )
+    return AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_profile_is_written_for_authorized_header(tmp_path):
+    async with profiled_client(tmp_path) as client:
+        response = await client.get("/", headers={"X-Profile": "secret"})
+
+    assert response.status_code == 200
+    filename = response.headers["x-profile-file"]
+    assert filename.startswith("user_service-GET-root-")
+    for line in (tmp_path / filename).read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_requests_without_the_key_are_not_profiled(tmp_path):
+    async with profiled_client(tmp_path) as client:
+        plain = await client.get("/")
+        wrong = await client.get("/", headers={"X-Profile": "guess"})
+
+    assert "x-profile-file" not in plain.headers
+    assert "x-profile-file" not in wrong.headers
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_write_speedscope_files(tmp_path):
+    async with profiled_client(tmp_path, sample_rate=1.0, output_format="speedscope") as client:
+        await client.get("/")
+
+    (path,) = tmp_path.iterdir()
+    assert path.name.endswith(".speedscope.json")
+    assert json.loads(path.read_text())["name"].startswith("GET / (")
@@ -0,0 +1,87 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from common.jwt_cache import VerifiedTokenCache
+
+KEY = "secret"
+ALGORITHMS = ["HS256"]
+
+
+def make_token(**claims) -> str:
+    return jwt.encode({"sub": "1", "type": "access", **claims}, KEY, algorithm="HS256")
+
+
+def test_repeated_token_skips_verification():
+    cache = VerifiedTokenCache(max_entries=10)
+    token = make_token(exp=int(time.time()) + 60)
+
+    first = cache.decode(token, KEY, ALGORITHMS)
+    with patch("jose.jwt.decode") as decode:
+        second = cache.decode(token, KEY, ALGORITHMS)
+
+    decode.assert_not_called()
+    assert second == first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_token_expires_like_an_uncached_one():
+    cache = VerifiedTokenCache(max_entries=10)
+    exp = int(time.time()) + 60
+    token = make_token(exp=exp)
+    cache.decode(token, KEY, ALGORITHMS)
+
+    # Still valid during the second of `exp` itself, as with jwt.decode
+    with patch("common.jwt_cache.time.time", return_value=exp + 0.9):
+        assert cache.decode(token, KEY, ALGORITHMS)["exp"] == exp
+
+    with (
+        patch("common.jwt_cache.time.time", return_value=exp + 1),
+        patch("jose.jwt.timegm", return_value=exp + 1),
+    ):
+        with pytest.raises(ExpiredSignatureError):
+            cache.decode(token, KEY, ALGORITHMS)
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_other_key_or_bad_token_is_verified():
+    cache = VerifiedTokenCache(max_entries=10)
+    token = make_token()
+    cache.decode(token, KEY, ALGORITHMS)
+
+    with pytest.raises(JWTError):
+        cache.decode(token, "rotated", ALGORITHMS)
+    with pytest.raises(JWTError):
+        cache.decode(token + "x", KEY, ALGORITHMS)
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2)
+    tokens = [make_token(sub=str(i)) for i in range(3)]
+    for token in tokens:
+        cache.decode(token, KEY, ALGORITHMS)
+
+    cache.decode(tokens[2], KEY, ALGORITHMS)
+    cache.decode(tokens[0], KEY, ALGORITHMS)
+
+    assert cache.stats() == {
+        "entries": 2,
+        "max_entries": 2,
+        "hits": 1,
+        "misses": 4,
+        "expired": 0,
+    }
+
+
+def test_cached_payload_is_a_copy():
+    cache = VerifiedTokenCache(max_entries=10)
+    token = make_token()
+    cache.decode(token, KEY, ALGORITHMS)["sub"] = "2"
+
+    assert cache.decode(token, KEY, ALGORITHMS)["sub"] == "1"
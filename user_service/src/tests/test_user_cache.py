@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_service.src.user.cache import NOT_CACHED, InMemoryBackend, UserCache, user_cache
+from user_service.src.user.crud import (
+    create_user,
+    find_user_by_email,
+    get_user_by_email,
+    update_hashed_password,
+)
+from user_service.src.user.schemas import UserRegisterSchema
+
+pytestmark = pytest.mark.usefixtures("mock_password_hashing")
+
+
+@contextmanager
+def count_queries(session: AsyncSession):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.asyncio
+async def test_hot_user_is_served_without_a_query(db_session: AsyncSession, valid_user: dict):
+    await create_user(db_session, UserRegisterSchema(**valid_user))
+    first = await get_user_by_email(db_session, valid_user["email"])
+
+    with count_queries(db_session) as statements:
+        second = await get_user_by_email(db_session, valid_user["email"])
+
+    assert statements == []
+    assert (second.id, second.email, second.date_of_birthday, second.created_at) == (
+        first.id,
+        first.email,
+        first.date_of_birthday,
+        first.created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_missing_user_is_cached_until_registration(
+    db_session: AsyncSession, monkeypatch, valid_user: dict
+):
+    monkeypatch.setattr(user_cache, "backend", InMemoryBackend())
+    assert await get_user_by_email(db_session, valid_user["email"]) is None
+    with count_queries(db_session) as statements:
+        assert await get_user_by_email(db_session, valid_user["email"]) is None
+    assert statements == []
+
+    await create_user(db_session, UserRegisterSchema(**valid_user))
+
+    assert (await get_user_by_email(db_session, valid_user["email"])).name == "John"
+
+
+@pytest.mark.asyncio
+async def test_password_update_invalidates_the_user(db_session: AsyncSession, valid_user: dict):
+    user = await create_user(db_session, UserRegisterSchema(**valid_user))
+    await get_user_by_email(db_session, valid_user["email"])
+
+    await update_hashed_password(db_session, user.id, user.hashed_password, "new-hash")
+
+    assert (await get_user_by_email(db_session, valid_user["email"])).hashed_password == "new-hash"
+    assert user_cache.stats()["invalidations"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_password_hashes_stay_out_of_the_cache(db_session: AsyncSession, valid_user: dict):
+    user = await create_user(db_session, UserRegisterSchema(**valid_user))
+    await get_user_by_email(db_session, valid_user["email"])
+
+    assert "hashed_password" not in await user_cache.get(f"user:id:{user.id}")
+    # Login still finds the user through the cache, but reads the hash from the database
+    with count_queries(db_session) as statements:
+        found = await find_user_by_email(db_session, db_session, valid_user["email"])
+    assert found.hashed_password == f"hashed_{valid_user['password']}"
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_is_shared_between_processes():
+    backend = InMemoryBackend()
+    # Two caches on one backend stand in for two worker processes
+    first = UserCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5, backend=backend)
+    second = UserCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5, backend=backend)
+
+    await first.set("user:id:1", {"id": 1})
+    assert await second.get("user:id:1") == {"id": 1}
+    assert second.stats()["backend_hits"] == 1
+
+    await first.invalidate("user:id:1")
+    second.clear()
+    assert await second.get("user:id:1") is NOT_CACHED
+
+
+@pytest.mark.asyncio
+async def test_registration_clears_misses_cached_by_other_processes():
+    backend = InMemoryBackend()
+    login_worker = UserCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5, backend=backend)
+    register_worker = UserCache(
+        max_entries=10, ttl_seconds=60, negative_ttl_seconds=5, backend=backend
+    )
+
+    # A login for an unknown email, answered from the backend the second time
+    await login_worker.set("user:email:john@example.com", None)
+    assert await login_worker.get("user:email:john@example.com") is None
+
+    await register_worker.invalidate("user:email:john@example.com")
+
+    assert await login_worker.get("user:email:john@example.com") is NOT_CACHED
+
+
+@pytest.mark.asyncio
+async def test_misses_are_not_cached_without_a_backend():
+    cache = UserCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5)
+
+    await cache.set("user:email:a@example.com", None)
+
+    assert await cache.get("user:email:a@example.com") is NOT_CACHED
+
+
+@pytest.mark.asyncio
+async def test_negative_entries_expire_sooner():
+    cache = UserCache(
+        max_entries=10, ttl_seconds=60, negative_ttl_seconds=0, backend=InMemoryBackend()
+    )
+
+    await cache.set("user:email:a@example.com", None)
+    await cache.set("user:email:b@example.com", 1)
+
+    assert await cache.get("user:email:a@example.com") is NOT_CACHED
+    assert await cache.get("user:email:b@example.com") == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_fall_back_to_misses():
+    class BrokenBackend(InMemoryBackend):
+        async def get(self, key):
+            raise ConnectionError("backend down")
+
+    cache = UserCache(
+        max_entries=10, ttl_seconds=60, negative_ttl_seconds=5, backend=BrokenBackend()
+    )
+
+    assert await cache.get("user:id:1") is NOT_CACHED
+    assert cache.stats()["backend_errors"] == 1
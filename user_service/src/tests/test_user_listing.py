@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_service.src.core.config import settings
+from user_service.src.user.models import UserModel
+
+ADMIN_KEY = "test-admin-key"
+STARTED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def admin_key(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", ADMIN_KEY)
+
+
+async def add_users(session: AsyncSession, surnames: list[str]) -> None:
+    # Pairs of users share a timestamp, so pages must break ties on id
+    session.add_all(
+        UserModel(
+            name="User",
+            surname=surname,
+            email=f"{surname.lower()}{i}@example.com",
+            date_of_birthday=date(1990, 1, 15),
+            hashed_password="hashed",
+            created_at=STARTED + timedelta(seconds=i // 2),
+        )
+        for i, surname in enumerate(surnames)
+    )
+    await session.commit()
+
+
+async def list_users(client: AsyncClient, **params) -> dict:
+    response = await client.get("/api/v1/user/", params=params, headers={"X-Admin-Key": ADMIN_KEY})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_cursor_walks_all_users_once_in_order(client: AsyncClient, db_session: AsyncSession):
+    await add_users(db_session, ["Doe"] * 7)
+
+    seen, cursor = [], None
+    while True:
+        page = await list_users(client, limit=3, **({"cursor": cursor} if cursor else {}))
+        seen.extend(user["id"] for user in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == list(range(1, 8))
+    assert "hashed_password" not in page["items"][0]
+
+
+@pytest.mark.asyncio
+async def test_prefix_filters_are_case_insensitive(client: AsyncClient, db_session: AsyncSession):
+    await add_users(db_session, ["Doe", "Dorian", "Smith", "do_e"])
+
+    assert [user["surname"] for user in (await list_users(client, surname="DO"))["items"]] == [
+        "Doe", "Dorian", "do_e",
+    ]
+    # `_` and `%` are matched literally
+    assert [user["surname"] for user in (await list_users(client, surname="do_"))["items"]] == ["do_e"]
+    assert [user["email"] for user in (await list_users(client, email="smith"))["items"]] == [
+        "smith2@example.com",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_listing_requires_admin_and_a_valid_cursor(client: AsyncClient):
+    assert (await client.get("/api/v1/user/")).status_code == 403
+
+    response = await client.get(
+        "/api/v1/user/", params={"cursor": "not-a-cursor"}, headers={"X-Admin-Key": ADMIN_KEY}
+    )
+    assert response.status_code == 400
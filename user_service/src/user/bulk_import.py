@@ -0,0 +1,132 @@
+"""
+Bulk user import from NDJSON (one UserRegisterSchema object per line).
+
+Usage:
+    python -m user_service.src.user.bulk_import users.ndjson > report.ndjson
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_service.src.core.config import settings
+from user_service.src.core.database import async_session_maker
+from user_service.src.security.hashing_pool import hashing_pool
+from user_service.src.user.crud import get_existing_emails, insert_users_ignoring_duplicates
+from user_service.src.user.schemas import UserRegisterSchema
+
+
+async def iter_lines(lines: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Adapt a blocking line iterator (a file) to the async interface `import_users` expects."""
+    for line in lines:
+        yield line
+
+
+async def import_users(
+    session: AsyncSession,
+    lines: AsyncIterable[bytes | str],
+    batch_size: int | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Import users from NDJSON lines, yielding one result per non-empty line.
+
+    Lines are validated one by one and written in batches of `batch_size`,
+    so memory use depends on the batch size, not on the input size.
+    Each result is `{"line", "email", "status"}` where status is one of
+    `created`, `duplicate` or `invalid` (the latter with an `error`).
+    """
+    batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+    batch: list[tuple[int, UserRegisterSchema]] = []
+    line_no = 0
+    async for raw in lines:
+        line_no += 1
+        if not raw.strip():
+            continue
+        try:
+            user = UserRegisterSchema.model_validate_json(raw)
+        except ValidationError as exc:
+            yield {"line": line_no, "email": None, "status": "invalid", "error": _format_errors(exc)}
+            continue
+
+        batch.append((line_no, user))
+        if len(batch) >= batch_size:
+            for result in await _import_batch(session, batch):
+                yield result
+            batch = []
+
+    if batch:
+        for result in await _import_batch(session, batch):
+            yield result
+
+
+async def _import_batch(
+    session: AsyncSession, batch: list[tuple[int, UserRegisterSchema]]
+) -> list[dict]:
+    emails = [str(user.email) for _, user in batch]
+    # Hashing is by far the most expensive step, so skip rows that would be
+    # rejected anyway: emails already stored and repeats within the batch.
+    taken = await get_existing_emails(session, emails)
+    to_insert: list[tuple[int, UserRegisterSchema]] = []
+    for (line_no, user), email in zip(batch, emails):
+        if email not in taken:
+            taken.add(email)
+            to_insert.append((line_no, user))
+
+    hashes = await hashing_pool.hash_many([user.password for _, user in to_insert])
+    inserted = await insert_users_ignoring_duplicates(
+        session,
+        [
+            {
+                "email": str(user.email),
+                "name": user.name,
+                "surname": user.surname,
+                "date_of_birthday": user.date_of_birthday,
+                "hashed_password": hashed,
+            }
+            for (_, user), hashed in zip(to_insert, hashes)
+        ],
+    )
+
+    created_lines = {line_no for line_no, user in to_insert if str(user.email) in inserted}
+    return [
+        {
+            "line": line_no,
+            "email": email,
+            "status": "created" if line_no in created_lines else "duplicate",
+        }
+        for (line_no, _), email in zip(batch, emails)
+    ]
+
+
+def _format_errors(exc: ValidationError) -> str:
+    # include_input=False keeps passwords out of the report
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+        for error in exc.errors(include_url=False, include_input=False)
+    )
+
+
+async def _main(path: str, batch_size: int) -> None:
+    counts = {"created": 0, "duplicate": 0, "invalid": 0}
+    await hashing_pool.start()
+    try:
+        with open(path, "rb") as file:
+            async with async_session_maker() as session:
+                async for result in import_users(session, iter_lines(file), batch_size):
+                    counts[result["status"]] += 1
+                    sys.stdout.write(json.dumps(result) + "\n")
+    finally:
+        hashing_pool.shutdown()
+    print(json.dumps(counts), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from an NDJSON file.")
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=settings.BULK_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_main(args.path, args.batch_size))
@@ -0,0 +1,225 @@
+"""
+Read-through cache for user lookups (see `get_user_by_id`/`get_user_by_email`).
+
+Two tiers:
+- an in-process TTL/LRU map, checked first and never shared;
+- an optional out-of-process backend (Redis, or anything implementing
+  `CacheBackend`), shared by every worker and instance.
+
+Values are plain JSON-compatible data, so both tiers store the same thing.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from user_service.src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Returned by `UserCache.get` when the key is in neither tier. `None` is a
+# cached negative result ("no such user").
+NOT_CACHED = object()
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class InMemoryBackend:
+    """
+    Dict-based `CacheBackend` with per-key expiry.
+
+    Stands in for Redis in tests and single-process setups; unlike the
+    local tier it stores serialized bytes, so it exercises the same code
+    path as a real out-of-process backend.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend:
+    """`CacheBackend` on Redis; needs the optional `redis` package."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("USER_CACHE_REDIS_URL requires the 'redis' package") from exc
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        await self._client.delete(*keys)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class UserCache:
+    """
+    Two-tier TTL cache with negative entries and hit/miss counters.
+
+    Writers must call `invalidate` after committing, which removes the keys
+    from the local tier and the backend. Other processes' local tiers are
+    only refreshed when their entries expire, so `ttl_seconds` bounds how
+    long they can serve a stale value; keep it short when a backend is used.
+
+    Negative entries ("no such user") are only kept in the backend, where
+    `invalidate` reaches them. In a local tier, another process would keep
+    telling a user who just registered that they don't exist. Without a
+    backend, misses are not cached at all.
+
+    Backend errors are logged and treated as misses, so an unavailable
+    backend degrades to database lookups instead of failing requests.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        backend: CacheBackend | None = None,
+        backend_ttl_seconds: float | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.backend = backend
+        self.backend_ttl_seconds = backend_ttl_seconds or ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.backend_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.backend_errors = 0
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self._count_hit(value)
+                return value
+            del self._entries[key]
+
+        if self.backend is not None:
+            try:
+                data = await self.backend.get(key)
+            except Exception:
+                self._backend_failed("get")
+                data = None
+            if data is not None:
+                value = json.loads(data)
+                self.backend_hits += 1
+                if value is not None:
+                    self._store(key, value)
+                self._count_hit(value)
+                return value
+
+        self.misses += 1
+        return NOT_CACHED
+
+    async def set(self, key: str, value: Any) -> None:
+        if value is not None:
+            self._store(key, value)
+        if self.backend is not None:
+            ttl = self.negative_ttl_seconds if value is None else self.backend_ttl_seconds
+            try:
+                await self.backend.set(key, json.dumps(value).encode(), ttl)
+            except Exception:
+                self._backend_failed("set")
+
+    async def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+        self.invalidations += len(keys)
+        if self.backend is not None and keys:
+            try:
+                await self.backend.delete(*keys)
+            except Exception:
+                self._backend_failed("delete")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def _store(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _count_hit(self, value: Any) -> None:
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+
+    def _backend_failed(self, operation: str) -> None:
+        self.backend_errors += 1
+        logger.warning("User cache backend %s failed", operation, exc_info=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "backend_errors": self.backend_errors,
+        }
+
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.USER_CACHE_NEGATIVE_TTL_SECONDS,
+    backend=RedisBackend(settings.USER_CACHE_REDIS_URL) if settings.USER_CACHE_REDIS_URL else None,
+    backend_ttl_seconds=settings.USER_CACHE_BACKEND_TTL_SECONDS,
+)
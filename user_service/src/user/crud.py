@@ -1,44 +1,226 @@
+from datetime import date, datetime
+
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from user_service.src.core.database import is_replica, replicas
+from user_service.src.user.cache import NOT_CACHED, user_cache
 from user_service.src.user.models import UserModel
 from user_service.src.user.schemas import UserRegisterSchema
-from user_service.src.security.password import hash_password
+from user_service.src.security.hashing_pool import hashing_pool
+
+
+def _insert(session: AsyncSession):
+    """Dialect-specific INSERT, needed for ON CONFLICT (SQLite is used in tests)."""
+    if session.bind.dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def _id_key(user_id: int) -> str:
+    return f"user:id:{user_id}"
+
+
+def _email_key(email: str) -> str:
+    # Points to the user id, so updates only need to invalidate the id key.
+    return f"user:email:{email}"
+
+
+def _to_cached(user: UserModel) -> dict:
+    # No `hashed_password`: the shared backend must not become a second copy
+    # of the password hashes. Login loads it with `get_hashed_password`.
+    return {
+        "id": user.id,
+        "name": user.name,
+        "surname": user.surname,
+        "email": user.email,
+        "date_of_birthday": user.date_of_birthday.isoformat(),
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat(),
+    }
+
+
+def _from_cached(row: dict) -> UserModel:
+    return UserModel(**{
+        **row,
+        "date_of_birthday": date.fromisoformat(row["date_of_birthday"]),
+        "created_at": datetime.fromisoformat(row["created_at"]),
+    })
 
 
 async def create_user(session: AsyncSession, user_data: UserRegisterSchema) -> UserModel:
+    """
+    Create a user with a single INSERT ... ON CONFLICT (email) DO NOTHING RETURNING.
 
-     new_user = UserModel(
-         email=str(user_data.email)
-     )
-     new_user.hashed_password = hash_password(user_data.password)
-     new_user.name = user_data.name
-     new_user.surname = user_data.surname
-     new_user.date_of_birthday = user_data.date_of_birthday
-     session.add(new_user)
-     try:
-         await session.flush()
-         await session.commit()
-         await session.refresh(new_user)
-     except IntegrityError:
-         await session.rollback()
-         raise HTTPException(
-             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
-         )
-     return new_user
+    Duplicate emails are detected by the unique `ix_users_email` index in the
+    same statement, so there is no check-then-insert race and no separate
+    SELECT/refresh round trip.
+
+    Raises:
+        HTTPException 400: Email is already registered
+    """
+    values = {
+        "email": str(user_data.email),
+        "name": user_data.name,
+        "surname": user_data.surname,
+        "date_of_birthday": user_data.date_of_birthday,
+        "hashed_password": await hashing_pool.hash(user_data.password),
+        "is_active": False,
+    }
+    result = await session.execute(
+        _insert(session)(UserModel)
+        .values(values)
+        .on_conflict_do_nothing(index_elements=[UserModel.email])
+        .returning(UserModel.id, UserModel.created_at)
+    )
+    row = result.first()
+    await session.commit()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exist"
+        )
+    # Drop negative entries from lookups made before the user existed
+    await user_cache.invalidate(_email_key(values["email"]), _id_key(row.id))
+    return UserModel(**values, id=row.id, created_at=row.created_at)
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> UserModel | None:
+    """
+    Look a user up by email, through the user cache.
+
+    Like `get_user_by_id`, a cache hit returns a detached `UserModel`
+    snapshot without `hashed_password`: read it, but load the row in the
+    session to change it.
+    A miss on a replica is not cached, it may just not have the row yet.
+    """
+    user_id = await user_cache.get(_email_key(email))
+    if user_id is None:
+        return None
+    if user_id is not NOT_CACHED:
+        return await get_user_by_id(session, user_id)
+
     result = await  session.execute(
         select(UserModel).where(UserModel.email == email)
     )
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    if user is not None or not is_replica(session):
+        await user_cache.set(_email_key(email), user.id if user else None)
+    if user is not None:
+        await user_cache.set(_id_key(user.id), _to_cached(user))
+    return user
 
 
 async def get_user_by_id(session: AsyncSession, user_id: int) -> UserModel | None:
+    """
+    Look a user up by id, through the user cache.
+
+    With a shared cache backend, missing users are cached too, for
+    `USER_CACHE_NEGATIVE_TTL_SECONDS`.
+    """
+    cached = await user_cache.get(_id_key(user_id))
+    if cached is None:
+        return None
+    if cached is not NOT_CACHED:
+        return _from_cached(cached)
+
     result = await session.execute(
         select(UserModel).where(UserModel.id == user_id)
     )
+    user = result.scalar_one_or_none()
+    if user is not None or not is_replica(session):
+        await user_cache.set(_id_key(user_id), _to_cached(user) if user else None)
+    return user
+
+
+async def get_hashed_password(session: AsyncSession, user_id: int) -> str | None:
+    """The user's password hash, always read from the database."""
+    result = await session.execute(
+        select(UserModel.hashed_password).where(UserModel.id == user_id)
+    )
     return result.scalar_one_or_none()
+
+
+async def _get_user_for_login(session: AsyncSession, email: str) -> UserModel | None:
+    user = await get_user_by_email(session, email)
+    if user is None or user.hashed_password is not None:
+        return user
+    # Served from the cache, which doesn't hold the hash
+    user.hashed_password = await get_hashed_password(session, user.id)
+    return user if user.hashed_password is not None else None
+
+
+async def find_user_by_email(
+    read_session: AsyncSession, session: AsyncSession, email: str
+) -> UserModel | None:
+    """
+    Look up a user for login, with `hashed_password` loaded.
+
+    The user is found through the cache on the read session. Its password
+    hash is always read from the database. The primary `session` is only
+    asked when `read_session` is a replica that does not have the user,
+    which happens right after registration while the replica catches up,
+    or that failed; the replica is then taken out of rotation until its
+    next health check passes.
+    """
+    if not is_replica(read_session):
+        return await _get_user_for_login(read_session, email)
+    try:
+        user = await _get_user_for_login(read_session, email)
+    except (SQLAlchemyError, OSError):
+        replicas.mark_down(read_session.bind)
+        user = None
+    if user is not None:
+        return user
+    return await _get_user_for_login(session, email)
+
+
+async def update_hashed_password(
+    session: AsyncSession, user_id: int, old_hash: str, new_hash: str
+) -> bool:
+    """
+    Replace a user's password hash, but only if it is still `old_hash`.
+
+    Returns False when the hash was changed concurrently, so a stale rehash
+    never overwrites a newer password.
+    """
+    result = await session.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id, UserModel.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    await session.commit()
+    await user_cache.invalidate(_id_key(user_id))
+    return result.rowcount == 1
+
+
+async def get_existing_emails(session: AsyncSession, emails: list[str]) -> set[str]:
+    result = await session.execute(
+        select(UserModel.email).where(UserModel.email.in_(emails))
+    )
+    return set(result.scalars().all())
+
+
+async def insert_users_ignoring_duplicates(session: AsyncSession, rows: list[dict]) -> set[str]:
+    """
+    Insert many users with one multi-row INSERT ... ON CONFLICT (email) DO NOTHING.
+
+    Returns the emails that were actually inserted; the rest already existed.
+    """
+    if not rows:
+        return set()
+    result = await session.execute(
+        _insert(session)(UserModel)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[UserModel.email])
+        .returning(UserModel.id, UserModel.email)
+    )
+    inserted = result.all()
+    await session.commit()
+    await user_cache.invalidate(
+        *(key for row in inserted for key in (_email_key(row.email), _id_key(row.id)))
+    )
+    return {row.email for row in inserted}
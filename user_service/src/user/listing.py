@@ -0,0 +1,109 @@
+"""
+Keyset-paginated user listing for admin tooling.
+
+Pages are ordered by `(created_at, id)` and the cursor is the last row's
+key, so every page is an index range scan starting right after the
+previous page (`ix_users_created_at_id`) instead of an OFFSET that reads
+and discards all earlier rows. Prefix filters use the `lower(...)`
+pattern indexes added in the same migration.
+"""
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from user_service.src.user.models import UserModel
+from user_service.src.user.schemas import UserListItemSchema
+
+# Rows fetched per round trip from the server-side cursor
+FETCH_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, user_id: int) -> str:
+    data = json.dumps([created_at.isoformat(), user_id]).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(data)
+        return datetime.fromisoformat(created_at), int(user_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def _prefix_pattern(prefix: str) -> str:
+    # The whole pattern is bound as one parameter (not `:prefix || '%'`),
+    # so PostgreSQL can turn it into an index range.
+    escaped = prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def users_page_query(
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+    email_prefix: str | None = None,
+    surname_prefix: str | None = None,
+):
+    """One row more than `limit`, so the caller knows whether there is a next page."""
+    query = select(UserModel).order_by(UserModel.created_at, UserModel.id).limit(limit + 1)
+    if after is not None:
+        created_at, user_id = after
+        # Typed like the columns, so the row comparison is a range on ix_users_created_at_id
+        query = query.where(
+            tuple_(UserModel.created_at, UserModel.id)
+            > tuple_(
+                literal(created_at, UserModel.created_at.type),
+                literal(user_id, UserModel.id.type),
+            )
+        )
+    if email_prefix:
+        query = query.where(
+            func.lower(UserModel.email).like(_prefix_pattern(email_prefix), escape="\\")
+        )
+    if surname_prefix:
+        query = query.where(
+            func.lower(UserModel.surname).like(_prefix_pattern(surname_prefix), escape="\\")
+        )
+    return query
+
+
+async def stream_users_page(
+    session: AsyncSession,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+    email_prefix: str | None = None,
+    surname_prefix: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream one page as a JSON object `{"items": [...], "next_cursor": ...}`.
+
+    Rows come from a server-side cursor and are written out as they
+    arrive; `next_cursor` is null on the last page.
+    """
+    result = await session.stream_scalars(
+        users_page_query(limit, after, email_prefix, surname_prefix),
+        execution_options={"yield_per": min(limit + 1, FETCH_SIZE)},
+    )
+    yield '{"items": ['
+    count = 0
+    last = None
+    next_cursor = None
+    async for user in result:
+        if count == limit:
+            next_cursor = encode_cursor(last.created_at, last.id)
+            break
+        yield ("," if count else "") + UserListItemSchema.model_validate(user).model_dump_json()
+        count += 1
+        last = user
+    await result.close()
+    yield f'], "next_cursor": {json.dumps(next_cursor)}}}'
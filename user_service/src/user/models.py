@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import String, Integer, Date, Boolean, DateTime, func
+from sqlalchemy import Index, String, Integer, Date, Boolean, DateTime, func
 
 from sqlalchemy.orm import Mapped, mapped_column
 from user_service.src.core.database import Base
@@ -21,4 +21,20 @@ class UserModel(Base):
     )
 
     def __repr__(self):
-        return f"<UserModel(id={self.id}, email={self.email})>"
\ No newline at end of file
+        return f"<UserModel(id={self.id}, email={self.email})>"
+
+
+# Keyset pagination of the user listing (see user/listing.py)
+Index("ix_users_created_at_id", UserModel.created_at, UserModel.id)
+# Case-insensitive prefix search; the pattern operator class lets LIKE 'abc%'
+# use the index under any collation. PostgreSQL only, like the migration.
+Index(
+    "ix_users_email_prefix",
+    func.lower(UserModel.email).label("email_lower"),
+    postgresql_ops={"email_lower": "varchar_pattern_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_users_surname_prefix",
+    func.lower(UserModel.surname).label("surname_lower"),
+    postgresql_ops={"surname_lower": "varchar_pattern_ops"},
+).ddl_if(dialect="postgresql")
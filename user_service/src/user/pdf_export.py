@@ -0,0 +1,237 @@
+"""
+Bulk export of profile PDFs as a streamed ZIP archive.
+
+Users are read with a server-side cursor in batches of
+`PDF_EXPORT_BATCH_SIZE`, rendered in parallel by a pool of worker
+processes (with pdf_service's `generate_user_pdf`) and written to the
+archive as each batch finishes, so memory use depends on the batch size,
+not on the number of exported users.
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+import zipfile
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pdf_service.src.pdf.service import generate_user_pdf, get_profile_template
+from user_service.src.core.config import settings
+from user_service.src.user.models import UserModel
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up() -> None:
+    """Compile the profile template once per worker, before the first export."""
+    get_profile_template()
+
+
+def _render_one(profile: dict) -> bytes | str:
+    """The profile's PDF, or why it couldn't be rendered."""
+    try:
+        return generate_user_pdf(**profile)
+    except Exception as exc:
+        # One bad profile must not abort the chunk: the archive is already streaming
+        return f"{type(exc).__name__}: {exc}"
+
+
+def _render_many(profiles: list[dict]) -> list[bytes | str]:
+    return [_render_one(profile) for profile in profiles]
+
+
+class PdfExportPool:
+    """
+    Renders profile PDFs for bulk exports in a pool of worker processes.
+
+    Like `PasswordHashingPool`, batches are split into one chunk per worker
+    so a batch costs one round-trip per worker rather than one per PDF. If
+    the pool has not been started, renders fall back to the default thread
+    executor.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._rendered = 0
+        self._failed = 0
+        self._total_seconds = 0.0
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up,
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.max_workers))
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def render_many(self, profiles: list[dict]) -> list[bytes | str]:
+        """PDFs in the order of `profiles`; profiles that failed to render get an error message."""
+        if not profiles:
+            return []
+        size = math.ceil(len(profiles) / self.max_workers)
+        chunks = [profiles[i:i + size] for i in range(0, len(profiles), size)]
+        executor: Executor | None = self._executor
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(executor, _render_many, chunk) for chunk in chunks)
+            )
+        finally:
+            self._pending -= 1
+            self._total_seconds += time.perf_counter() - started
+        pdfs = [pdf for chunk in results for pdf in chunk]
+        failed = sum(isinstance(pdf, str) for pdf in pdfs)
+        self._rendered += len(pdfs) - failed
+        self._failed += failed
+        return pdfs
+
+    def stats(self) -> dict:
+        return {
+            "running": self._executor is not None,
+            "max_workers": self.max_workers,
+            "batches_in_flight": self._pending,
+            "rendered": self._rendered,
+            "failed": self._failed,
+            "renders_per_second": (
+                self._rendered / self._total_seconds if self._total_seconds else 0.0
+            ),
+        }
+
+
+pdf_export_pool = PdfExportPool(max_workers=settings.PDF_EXPORT_WORKERS)
+
+
+class _ChunkBuffer:
+    """
+    Write-only file object for `zipfile`; the archive is taken out chunk by chunk.
+
+    It has no `seek`/`tell`, so `ZipFile` writes sizes and CRCs in data
+    descriptors after each entry instead of seeking back to patch the
+    local headers, which is what makes the archive streamable.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def iter_user_batches(
+    session: AsyncSession,
+    start_id: int | None = None,
+    end_id: int | None = None,
+    is_active: bool | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[UserModel]]:
+    """Users in id order, fetched from a server-side cursor `batch_size` rows at a time."""
+    query = select(UserModel).order_by(UserModel.id)
+    if start_id is not None:
+        query = query.where(UserModel.id >= start_id)
+    if end_id is not None:
+        query = query.where(UserModel.id <= end_id)
+    if is_active is not None:
+        query = query.where(UserModel.is_active == is_active)
+
+    result = await session.stream_scalars(
+        query, execution_options={"yield_per": batch_size or settings.PDF_EXPORT_BATCH_SIZE}
+    )
+    async for partition in result.partitions():
+        yield partition
+
+
+def _write_entry(archive: zipfile.ZipFile, name: str, data: bytes | str) -> None:
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    archive.writestr(info, data)
+
+
+def _write_entries(
+    archive: zipfile.ZipFile, names: list[str], pdfs: list[bytes | str], errors: list[str]
+) -> None:
+    """Add the rendered PDFs; profiles that failed are appended to `errors` instead."""
+    for name, pdf in zip(names, pdfs):
+        if isinstance(pdf, str):
+            logger.warning("Skipping %s in PDF export: %s", name, pdf)
+            errors.append(f"{name}: {pdf}\n")
+        else:
+            _write_entry(archive, name, pdf)
+
+
+async def export_profile_pdfs(
+    session: AsyncSession,
+    start_id: int | None = None,
+    end_id: int | None = None,
+    is_active: bool | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive with `profiles/<id>.pdf` for every matching user.
+
+    Rendering of one batch overlaps with fetching the next one; at most two
+    batches are held in memory at any time. Profiles that can't be rendered
+    are left out and listed with the reason in a final `errors.txt` entry.
+    """
+    buffer = _ChunkBuffer()
+    pending: tuple[list[str], asyncio.Task] | None = None
+    errors: list[str] = []
+    try:
+        with zipfile.ZipFile(buffer, "w") as archive:
+            async for users in iter_user_batches(session, start_id, end_id, is_active, batch_size):
+                names = [f"profiles/{user.id}.pdf" for user in users]
+                render = asyncio.create_task(pdf_export_pool.render_many([
+                    {
+                        "name": user.name,
+                        "surname": user.surname,
+                        "email": user.email,
+                        "date_of_birthday": str(user.date_of_birthday),
+                    }
+                    for user in users
+                ]))
+                if pending is not None:
+                    # Compressing is CPU work too; keep it off the event loop.
+                    await asyncio.to_thread(
+                        _write_entries, archive, pending[0], await pending[1], errors
+                    )
+                    yield buffer.take()
+                pending = (names, render)
+
+            if pending is not None:
+                await asyncio.to_thread(
+                    _write_entries, archive, pending[0], await pending[1], errors
+                )
+                pending = None
+            if errors:
+                _write_entry(archive, "errors.txt", "".join(errors))
+        yield buffer.take()
+    finally:
+        if pending is not None:
+            pending[1].cancel()
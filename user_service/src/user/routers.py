@@ -1,20 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from tempfile import SpooledTemporaryFile
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from user_service.src.user.crud import create_user, get_user_by_email
-from user_service.src.core.database import get_async_session
+from common.metrics import STAGE_SECONDS
+from user_service.src.core.dependencies import require_admin
+from user_service.src.user.bulk_import import import_users, iter_lines
+from user_service.src.user.listing import InvalidCursor, decode_cursor, stream_users_page
+from user_service.src.user.pdf_export import export_profile_pdfs
+
+from user_service.src.user.crud import create_user, find_user_by_email, update_hashed_password
+from user_service.src.core.database import (
+    async_session_maker,
+    get_async_session,
+    get_read_session,
+)
 from user_service.src.user.schemas import (
     UserRegisterSchema,
     UserResponseSchema,
     UserLoginSchema,
     UserLoginResponseSchema,
+    UserListPageSchema,
 )
-from user_service.src.security.password import verify_password
+from user_service.src.security.hashing_pool import hashing_pool
+from user_service.src.security.password import needs_rehash
 from user_service.src.security.token_manager import create_access_token
 
 router = APIRouter(prefix="/user", tags=["User"])
 
 
+async def rehash_password(user_id: int, password: str, old_hash: str) -> None:
+    """
+    Re-hash a password with the current cost policy after a successful login.
+
+    Runs as a background task, after the response is sent, with its own
+    session — the request session is already closed by then.
+    """
+    new_hash = await hashing_pool.hash(password)
+    async with async_session_maker() as session:
+        await update_hashed_password(session, user_id, old_hash, new_hash)
+
+
+@router.get(
+    "/",
+    summary="List users",
+    description=(
+        "Pages of users ordered by registration time. Pass `next_cursor` of a "
+        "page as `cursor` to get the next one; it is null on the last page. "
+        "`email` and `surname` are case-insensitive prefix filters."
+    ),
+    dependencies=[Depends(require_admin)],
+    response_class=StreamingResponse,
+    responses={200: {"model": UserListPageSchema}},
+)
+async def list_users(
+    limit: int = Query(default=50, ge=1, le=1000),
+    cursor: str | None = None,
+    email: str | None = Query(default=None, min_length=1, max_length=255),
+    surname: str | None = Query(default=None, min_length=1, max_length=255),
+    session: AsyncSession = Depends(get_read_session),
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return StreamingResponse(
+        stream_users_page(session, limit, after, email, surname),
+        media_type="application/json",
+    )
+
+
 @router.post(
     "/register/",
     response_model=UserResponseSchema,
@@ -25,12 +82,6 @@ async def register(
     user_data: UserRegisterSchema,
     session: AsyncSession = Depends(get_async_session),
 ):
-    existing_user = await get_user_by_email(session, user_data.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already exist",
-        )
     await create_user(session, user_data)
     return UserResponseSchema(message="User registered successfully")
 
@@ -42,21 +93,92 @@ async def register(
 )
 async def login(
     credentials: UserLoginSchema,
+    background_tasks: BackgroundTasks,
+    read_session: AsyncSession = Depends(get_read_session),
     session: AsyncSession = Depends(get_async_session),
 ):
-    user = await get_user_by_email(session, credentials.email)
+    # The primary session only connects if the replica can't answer
+    with STAGE_SECONDS.time("crud.get_user_by_email"):
+        user = await find_user_by_email(read_session, session, credentials.email)
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    verified = False
+    if user is not None:
+        with STAGE_SECONDS.time("verify_password"):
+            verified = await hashing_pool.verify(credentials.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
 
-    token = create_access_token(
-        user_id=user.id,
-        email=user.email,
-        name=user.name,
-        surname=user.surname,
-        date_of_birthday=str(user.date_of_birthday),
-    )
+    if needs_rehash(user.hashed_password):
+        background_tasks.add_task(
+            rehash_password, user.id, credentials.password, user.hashed_password
+        )
+
+    with STAGE_SECONDS.time("create_access_token"):
+        token = create_access_token(
+            user_id=user.id,
+            email=user.email,
+            name=user.name,
+            surname=user.surname,
+            date_of_birthday=str(user.date_of_birthday),
+        )
     return UserLoginResponseSchema(access_token=token)
+
+
+@router.post(
+    "/import/",
+    summary="Bulk import users from NDJSON",
+    description=(
+        "Accepts one registration object per line (application/x-ndjson) and "
+        "streams back one result line per input line."
+    ),
+    dependencies=[Depends(require_admin)],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def bulk_import(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    # The body is spooled first (in memory up to 1 MiB, then on disk):
+    # the response starts streaming before the upload could be fully read,
+    # and reading both at once is not supported by every ASGI server.
+    upload = SpooledTemporaryFile(max_size=1024 * 1024)
+    async for chunk in request.stream():
+        upload.write(chunk)
+    upload.seek(0)
+
+    async def report():
+        try:
+            async for result in import_users(session, iter_lines(upload)):
+                yield json.dumps(result) + "\n"
+        finally:
+            upload.close()
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/export/pdf/",
+    summary="Bulk export profile PDFs as a ZIP archive",
+    description=(
+        "Streams a ZIP archive with `profiles/<id>.pdf` for every user in the "
+        "optional id range, optionally filtered by `is_active`."
+    ),
+    dependencies=[Depends(require_admin)],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/zip": {}}}},
+)
+async def bulk_export_pdf(
+    start_id: int | None = Query(default=None, ge=1),
+    end_id: int | None = Query(default=None, ge=1),
+    is_active: bool | None = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    return StreamingResponse(
+        export_profile_pdfs(session, start_id, end_id, is_active),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=profiles.zip"},
+    )
@@ -1,6 +1,6 @@
-from datetime import date
+from datetime import date, datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserRegisterSchema(BaseModel):
@@ -25,6 +25,23 @@ class UserResponseSchema(BaseModel):
     message: str
 
 
+class UserListItemSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    surname: str
+    email: str
+    date_of_birthday: date
+    is_active: bool
+    created_at: datetime
+
+
+class UserListPageSchema(BaseModel):
+    items: list[UserListItemSchema]
+    next_cursor: str | None
+
+
 class CurrentUserDTO(BaseModel):
     id: int
     email: str